@@ -1,8 +1,6 @@
 # Streamlit 앱
 import streamlit as st
 from streamlit_option_menu import option_menu
-from modules.naver_news import render_naver_news_page
-from modules.real_estate import render_real_estate_page
 from modules.sidebar import create_sidebar
 
 st.set_page_config(
@@ -10,6 +8,9 @@ st.set_page_config(
     page_icon="🌟"  # 탭 아이콘
 )
 
+# 페이지 모듈(gensim, konlpy, wordcloud 등)은 해당 페이지를 선택했을 때만 불러옵니다.
+# 첫 화면 로딩 시간 확인: python -m benchmarks.check_import_budget
+
 # 사이드바 메뉴 생성
 with st.sidebar:
     selected = create_sidebar()
@@ -21,8 +22,10 @@ if selected == "메인 페이지":
 
 # 네이버 뉴스 페이지
 elif selected == "네이버 뉴스":
+    from modules.naver_news import render_naver_news_page
     render_naver_news_page()
 
 # 부동산 정보 페이지
 elif selected == "부동산 정보":
+    from modules.real_estate import render_real_estate_page
     render_real_estate_page()
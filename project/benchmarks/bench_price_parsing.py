@@ -0,0 +1,69 @@
+# 가격 파싱 벤치마크: 행 단위 apply vs 벡터화 parse_price_series
+# 사용법 (project/ 디렉터리에서): python -m benchmarks.bench_price_parsing --rows 100000
+import argparse
+import random
+import time
+import pandas as pd
+from modules.utils import parse_price, parse_price_series
+
+
+def make_prices(rows, seed=0):
+    """hanPrc 형식의 가격 문자열을 무작위로 생성합니다. (약 1%는 잘못된 값)"""
+    rng = random.Random(seed)
+    prices = []
+    for _ in range(rows):
+        roll = rng.random()
+        if roll < 0.01:
+            prices.append('정보 없음')
+        elif roll < 0.2:
+            prices.append(f"{rng.randint(1, 9)},{rng.randint(0, 999):03d}")
+        elif roll < 0.5:
+            prices.append(f"{rng.randint(1, 60)}억")
+        else:
+            prices.append(f"{rng.randint(1, 60)}억 {rng.randint(1, 9)},{rng.randint(0, 999):03d}")
+    return pd.Series(prices)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(rows=100000, repeat=3):
+    prices = make_prices(rows)
+
+    # 두 방식의 결과가 같은지 먼저 확인
+    expected = prices.apply(parse_price)
+    converted, rejected = parse_price_series(prices)
+    assert converted.isna().sum() == expected.isna().sum() == rejected
+    assert (converted.dropna().astype('int64') == expected.dropna().astype('int64')).all()
+
+    apply_seconds = best_of(lambda: prices.apply(parse_price), repeat)
+    vectorized_seconds = best_of(lambda: parse_price_series(prices), repeat)
+    return {
+        'rows': rows,
+        'rejected': rejected,
+        'apply_seconds': round(apply_seconds, 4),
+        'vectorized_seconds': round(vectorized_seconds, 4),
+        'speedup': round(apply_seconds / vectorized_seconds, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가격 파싱 벤치마크")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.repeat)
+    print(f"{result['rows']}행 (변환 실패 {result['rejected']}건)")
+    print(f"apply(parse_price): {result['apply_seconds']:.4f}초")
+    print(f"parse_price_series: {result['vectorized_seconds']:.4f}초 ({result['speedup']}배)")
+
+
+if __name__ == '__main__':
+    main()
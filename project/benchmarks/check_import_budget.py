@@ -0,0 +1,95 @@
+# 앱 시작(임포트) 시간 점검: 페이지별로 새 파이썬 프로세스에서 모듈을 임포트해 시간과 무거운 의존성 로딩 여부를 확인합니다.
+# 사용법 (project/ 디렉터리에서): python -m benchmarks.check_import_budget --budget 2.0
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 페이지별로 임포트하는 모듈과, 그 시점에 로드되면 안 되는 무거운 모듈
+PAGES = {
+    "메인 페이지": {
+        "imports": ["streamlit", "streamlit_option_menu", "modules", "modules.sidebar"],
+        "forbidden": ["gensim", "konlpy", "jpype", "nltk", "wordcloud", "matplotlib", "seaborn", "altair"],
+    },
+    "부동산 정보": {
+        "imports": ["modules.real_estate"],
+        "forbidden": ["gensim", "konlpy", "jpype", "nltk", "wordcloud", "matplotlib", "seaborn"],
+    },
+    "네이버 뉴스": {
+        "imports": ["modules.naver_news"],
+        "forbidden": ["konlpy", "jpype", "nltk", "wordcloud", "matplotlib", "seaborn"],
+    },
+}
+
+# 자식 프로세스에서 실행할 코드: 임포트 시간과 로드된 금지 모듈을 JSON으로 출력
+_PROBE = """
+import importlib, json, sys, time
+imports, forbidden = json.loads(sys.argv[1]), json.loads(sys.argv[2])
+start = time.perf_counter()
+for name in imports:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+loaded = sorted(name for name in forbidden if name in sys.modules)
+print(json.dumps({'seconds': elapsed, 'loaded': loaded}))
+"""
+
+
+def measure(imports, forbidden):
+    """새 프로세스에서 모듈을 임포트하고 {'seconds', 'loaded'}를 반환합니다."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, json.dumps(imports), json.dumps(forbidden)],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "임포트 실패")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(budget=2.0, repeat=3, pages=None):
+    """
+    페이지별 임포트 시간(최솟값)과 무거운 모듈 로딩 여부를 측정합니다.
+    :param budget: 메인 페이지 임포트 시간 목표(초)
+    :return: 페이지별 결과 dict와 통과 여부
+    """
+    results = {}
+    passed = True
+    for page, spec in PAGES.items():
+        if pages and page not in pages:
+            continue
+        try:
+            samples = [measure(spec["imports"], spec["forbidden"]) for _ in range(repeat)]
+        except RuntimeError as e:
+            results[page] = {'error': str(e)}
+            passed = False
+            continue
+        seconds = min(sample['seconds'] for sample in samples)
+        loaded = samples[0]['loaded']
+        results[page] = {'seconds': round(seconds, 3), 'loaded': loaded}
+        if loaded or (page == "메인 페이지" and seconds > budget):
+            passed = False
+    return results, passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 시작 임포트 시간 점검")
+    parser.add_argument('--budget', type=float, default=2.0, help="메인 페이지 임포트 시간 목표(초)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('pages', nargs='*', help="점검할 페이지 (기본값: 전체)")
+    args = parser.parse_args()
+
+    results, passed = run(args.budget, args.repeat, args.pages)
+    for page, result in results.items():
+        if 'error' in result:
+            print(f"{page}: 임포트 실패 - {result['error']}")
+            continue
+        loaded = f" (로드된 무거운 모듈: {', '.join(result['loaded'])})" if result['loaded'] else ""
+        print(f"{page}: {result['seconds']:.3f}초{loaded}")
+    print("통과" if passed else f"실패 (메인 페이지 목표 {args.budget}초, 무거운 모듈은 해당 페이지 선택 시에만 로드)")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
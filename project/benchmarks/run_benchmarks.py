@@ -0,0 +1,282 @@
+# 토픽 분석/부동산 주요 경로 벤치마크
+# 사용법 (project/ 디렉터리에서): python -m benchmarks.run_benchmarks [--only perform_lda ...] [--compare 이전결과.json]
+# 결과는 benchmarks/results/<시각>.json에 기록되며, --compare로 이전 실행과 비교할 수 있습니다.
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.stub_server import ARTICLE_LIST_PATH, FIXTURE_DIR, NEWS_SECTION_PATH, StubServer, load_fixtures
+from modules.paths import BASE_DIR, DATA_DIR
+
+RESULTS_DIR = os.path.join(BASE_DIR, 'benchmarks', 'results')
+
+
+def load_category_texts(data_dir=DATA_DIR):
+    """data/*.json 픽스처의 processed_body를 카테고리 순서대로 모두 읽습니다."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.json'))):
+        if os.path.basename(path) == 'dong_options.json':
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.extend(article.get('processed_body', '') for article in json.load(f))
+    return [text for text in texts if text]
+
+
+def load_apartment_rows(rows):
+    """기록된 articleList 응답을 get_apartments 결과 형식으로 바꾸고 rows행이 되도록 반복합니다."""
+    items = []
+    for _, body in sorted(load_fixtures('article_list').items()):
+        items.extend(json.loads(body)['body'])
+    apartments = [{
+        'name': item['atclNm'], 'price': item['hanPrc'], 'transaction_type': item['tradTpNm'],
+        'area': item['spc2'], 'floor': item['flrInfo'],
+    } for item in items]
+    return (apartments * (rows // len(apartments) + 1))[:rows]
+
+
+def measure(func, repeat):
+    """func를 repeat번 실행한 시간(초) 목록과 마지막 반환값"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def summarize(timings, **extra):
+    return dict(extra, repeat=len(timings), seconds_min=round(min(timings), 5),
+                seconds_median=round(statistics.median(timings), 5))
+
+
+class BenchmarkContext:
+    """벤치마크 사이에 공유하는 입력과 중간 결과 (토큰화 결과, 학습된 모델 등)"""
+
+    def __init__(self, args):
+        self.args = args
+        self.texts = load_category_texts()
+        self.tokenized_texts = None
+        self.lda = None
+
+    def tokens(self):
+        # 저장된 processed_body는 형태소를 공백으로 이은 문자열이므로 Okt 없이 토큰 목록을 만들 수 있음
+        if self.tokenized_texts is None:
+            self.tokenized_texts = [[word for word in text.split() if len(word) > 1] for text in self.texts]
+        return self.tokenized_texts
+
+    def trained_lda(self):
+        if self.lda is None:
+            from modules.topic_modeling import perform_lda
+            self.lda = perform_lda(self.tokens(), num_topics=self.args.num_topics, passes=self.args.passes)
+        return self.lda
+
+
+def bench_preprocess_data(ctx):
+    """preprocess_data: 빈 토큰 캐시(형태소 분석 포함)와 채워진 캐시(캐시 조회만)"""
+    from modules.token_cache import TokenCache
+    from modules.topic_modeling import preprocess_data
+
+    cold, warm = [], []
+    for _ in range(ctx.args.repeat):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = TokenCache(os.path.join(tmp_dir, 'tokens.sqlite3'))
+            cold.extend(measure(lambda: preprocess_data(ctx.texts, cache=cache, workers=ctx.args.workers), 1)[0])
+            warm.extend(measure(lambda: preprocess_data(ctx.texts, cache=cache, workers=ctx.args.workers), 1)[0])
+    return {
+        'cold': summarize(cold, docs=len(ctx.texts)),
+        'warm': summarize(warm, docs=len(ctx.texts)),
+    }
+
+
+def bench_perform_lda(ctx):
+    from modules.topic_modeling import perform_lda
+
+    tokens = ctx.tokens()
+    timings, result = measure(
+        lambda: perform_lda(tokens, num_topics=ctx.args.num_topics, passes=ctx.args.passes), ctx.args.repeat
+    )
+    ctx.lda = result
+    return summarize(timings, docs=len(tokens), num_topics=ctx.args.num_topics, passes=ctx.args.passes)
+
+
+def bench_topic_labels(ctx):
+    from modules.topic_modeling import generate_topic_labels_with_context
+
+    lda_model = ctx.trained_lda()[0]
+    timings, _ = measure(
+        lambda: generate_topic_labels_with_context(lda_model, num_topics=ctx.args.num_topics, language="kor"),
+        ctx.args.repeat
+    )
+    return summarize(timings, num_topics=ctx.args.num_topics)
+
+
+def bench_related_articles(ctx):
+    """display_related_articles의 점수 계산: 문서-토픽 행렬 계산과 토픽별 상위 문서 선택"""
+    from modules.topic_modeling import document_topic_matrix
+    from modules.visualization import top_related_documents
+
+    lda_model, corpus, _, _ = ctx.trained_lda()
+    matrix_timings, doc_topics = measure(lambda: document_topic_matrix(lda_model, corpus), ctx.args.repeat)
+    top_timings, _ = measure(
+        lambda: [top_related_documents(doc_topics, topic_id) for topic_id in range(ctx.args.num_topics)],
+        ctx.args.repeat
+    )
+    return {
+        'doc_topic_matrix': summarize(matrix_timings, docs=len(corpus)),
+        'top_documents': summarize(top_timings, topics=ctx.args.num_topics),
+    }
+
+
+def bench_create_dataframe(ctx):
+    """수집 단계의 매물 테이블 변환(build_listing_table)과 화면별 create_dataframe, convert_price"""
+    import pandas as pd
+    from modules.data_processing import build_listing_table
+    from modules.utils import convert_price
+    from modules.visualization import create_dataframe
+
+    apartments = load_apartment_rows(ctx.args.rows)
+    build_timings, table = measure(lambda: build_listing_table(apartments, dong='서초동'), ctx.args.repeat)
+    dataframe_timings, _ = measure(lambda: create_dataframe(table, '매매'), ctx.args.repeat)
+    convert_timings, _ = measure(lambda: [convert_price(apt['price']) for apt in apartments], ctx.args.repeat)
+    return {
+        'build_listing_table': summarize(build_timings, rows=len(apartments),
+                                         bytes_dicts=int(pd.DataFrame(apartments).memory_usage(deep=True).sum()),
+                                         bytes_table=int(table.memory_usage(deep=True).sum())),
+        'create_dataframe': summarize(dataframe_timings, rows=len(table)),
+        'convert_price': summarize(convert_timings, rows=len(apartments)),
+    }
+
+
+def bench_get_apartments(ctx):
+    from modules.fetch_data import get_apartments
+    from modules.http_client import RateLimiter
+
+    with open(os.path.join(DATA_DIR, 'dong_options.json'), 'r', encoding='utf-8') as f:
+        dong_options = json.load(f)
+    dong = next(iter(dong_options))
+    with StubServer() as server:
+        # 속도 제한 대기 시간이 아니라 요청/파싱 비용을 재기 위해 제한을 사실상 없앰
+        limiter = RateLimiter(rate=10000, burst=100)
+        timings, apartments = measure(
+            lambda: get_apartments(dong, dong_options, base_url=server.base_url + ARTICLE_LIST_PATH, limiter=limiter),
+            ctx.args.repeat
+        )
+        requests_made = server.requests
+    return summarize(timings, listings=len(apartments), requests=requests_made // ctx.args.repeat)
+
+
+def bench_fetch_articles(ctx):
+    from modules.crawler import NewsCrawler
+
+    with StubServer() as server:
+        crawler = NewsCrawler(server.base_url + NEWS_SECTION_PATH, base_url=server.base_url, rate=10000)
+        timings, articles = measure(lambda: crawler.fetch_articles(101, max_pages=10), ctx.args.repeat)
+        requests_made = server.requests
+    return summarize(timings, articles=len(articles), requests=requests_made // ctx.args.repeat)
+
+
+BENCHMARKS = {
+    'preprocess_data': bench_preprocess_data,
+    'perform_lda': bench_perform_lda,
+    'topic_labels': bench_topic_labels,
+    'related_articles': bench_related_articles,
+    'create_dataframe': bench_create_dataframe,
+    'get_apartments': bench_get_apartments,
+    'fetch_articles': bench_fetch_articles,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """선택한 벤치마크를 실행하고 결과 dict를 반환합니다. 실패한 항목은 error로 기록합니다."""
+    ctx = BenchmarkContext(args)
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"[{name}] 실행 중...")
+        try:
+            results[name] = bench(ctx)
+        except Exception as e:  # 의존성이 없는 환경 등: 나머지 벤치마크는 계속 실행
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+        print(f"[{name}] {json.dumps(results[name], ensure_ascii=False)}")
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'fixtures': {'data_dir': DATA_DIR, 'fixture_dir': FIXTURE_DIR, 'docs': len(ctx.texts)},
+        'params': {'repeat': args.repeat, 'passes': args.passes, 'num_topics': args.num_topics,
+                   'rows': args.rows, 'workers': args.workers},
+        'benchmarks': results,
+    }
+
+
+def flatten(results, prefix=''):
+    """{'이름': {'하위': {'seconds_min': ...}}} -> {'이름.하위': seconds_min}"""
+    flat = {}
+    for name, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        if 'seconds_min' in value:
+            flat[prefix + name] = value['seconds_min']
+        else:
+            flat.update(flatten(value, prefix + name + '.'))
+    return flat
+
+
+def compare(baseline, current):
+    """두 실행 결과의 항목별 최소 시간을 비교해 출력합니다."""
+    before, after = flatten(baseline['benchmarks']), flatten(current['benchmarks'])
+    print(f"\n비교 기준: {baseline.get('created_at')} ({baseline.get('git_commit')})")
+    for name in sorted(set(before) | set(after)):
+        if name in before and name in after and before[name] > 0:
+            print(f"{name}: {before[name]:.5f}초 -> {after[name]:.5f}초 ({after[name] / before[name]:.2f}배)")
+        else:
+            print(f"{name}: {before.get(name, '-')} -> {after.get(name, '-')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="토픽 분석/부동산 벤치마크")
+    parser.add_argument('--only', nargs='*', choices=list(BENCHMARKS), help="실행할 벤치마크 (기본값: 전체)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--passes', type=int, default=15, help="perform_lda 패스 수")
+    parser.add_argument('--num-topics', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=20000, help="create_dataframe 입력 행 수")
+    parser.add_argument('--workers', type=int, default=None, help="preprocess_data 프로세스 풀 워커 수")
+    parser.add_argument('--output', help="결과 JSON 경로 (기본값: benchmarks/results/<시각>.json)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    from modules.tokenizer_service import get_tokenizer
+    get_tokenizer(autostart=False)  # 벤치마크가 끝난 뒤 형태소 분석 서비스 프로세스가 남지 않도록 함
+    result = run(args)
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), result)
+
+
+if __name__ == '__main__':
+    main()
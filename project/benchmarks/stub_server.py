@@ -0,0 +1,86 @@
+# 벤치마크용 로컬 HTTP 서버: 기록해 둔 articleList / 네이버 뉴스 섹션 응답(fixtures/)을 그대로 돌려줍니다.
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+ARTICLE_LIST_PATH = '/api/articleList'
+NEWS_SECTION_PATH = '/section/template/SECTION_ARTICLE_LIST'
+
+# 경로 -> (픽스처 디렉터리, 페이지 번호 파라미터, 마지막 페이지 이후 응답)
+ROUTES = {
+    ARTICLE_LIST_PATH: ('article_list', 'page', {'isMoreData': False, 'more': False, 'body': []}),
+    NEWS_SECTION_PATH: ('news_section', 'pageNo', {'renderedComponent': {'SECTION_ARTICLE_LIST': ''}}),
+}
+
+
+def load_fixtures(name):
+    """픽스처 디렉터리의 page_<n>.json을 {페이지 번호: 응답 바이트}로 읽습니다."""
+    directory = os.path.join(FIXTURE_DIR, name)
+    pages = {}
+    for file_name in os.listdir(directory):
+        if file_name.startswith('page_') and file_name.endswith('.json'):
+            with open(os.path.join(directory, file_name), 'rb') as f:
+                pages[int(file_name[5:-5])] = f.read()
+    return pages
+
+
+class StubServer:
+    """
+    기록된 응답을 제공하는 스레드 기반 HTTP 서버입니다.
+    with 문으로 사용하면 빈 포트에서 시작하고 끝나면 종료합니다.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        fixtures = {path: (load_fixtures(name), param, json.dumps(empty).encode('utf-8'))
+                    for path, (name, param, empty) in ROUTES.items()}
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive 지원 (실제 서버와 같은 커넥션 재사용)
+
+            def do_GET(self):
+                server.requests += 1
+                url = urlparse(self.path)
+                if url.path not in fixtures:
+                    self.send_error(404)
+                    return
+                pages, param, empty = fixtures[url.path]
+                page = int(parse_qs(url.query).get(param, ['1'])[0])
+                body = pages.get(page, empty)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청 로그 출력 생략
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
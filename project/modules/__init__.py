@@ -1,2 +1,9 @@
 # modules/__init__.py
-from .visualization import generate_wordcloud_image
+# 페이지 모듈은 무거운 의존성(wordcloud, matplotlib 등)을 불러오므로 실제로 사용할 때 임포트합니다.
+
+
+def __getattr__(name):
+    if name == "generate_wordcloud_image":
+        from .visualization import generate_wordcloud_image
+        return generate_wordcloud_image
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,165 @@
+import json
+import os
+import tempfile
+import threading
+from array import array
+from modules.paths import DATA_DIR, category_data_path
+
+# 기사 레코드의 컬럼 (컬럼별로 파일을 분리해 필요한 컬럼만 읽음)
+COLUMNS = ('title', 'body', 'link', 'processed_body')
+OFFSET_SIZE = array('Q').itemsize
+
+# 같은 프로세스 안에서 저장소 기록(추가/변환)을 직렬화
+_write_lock = threading.RLock()
+
+
+class ColumnView:
+    """
+    저장소의 일부 컬럼에 대한 읽기 전용 뷰입니다.
+    리스트처럼 len()과 인덱스 접근을 지원하며, 접근한 행만 디스크에서 읽습니다.
+    """
+
+    def __init__(self, store, columns):
+        self.store = store
+        self.columns = columns
+
+    def __len__(self):
+        return self.store.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.store.get_rows([index], self.columns)[0]
+
+    def __iter__(self):
+        return self.store.iter_records(self.columns)
+
+
+class ArticleStore:
+    """
+    카테고리별 컬럼형 기사 저장소입니다.
+    저장 경로: <data_dir>/<카테고리>/
+      - <컬럼>.jsonl : 한 줄에 한 기사의 값(JSON 문자열)
+      - <컬럼>.idx   : 각 줄의 시작 바이트 오프셋 (uint64 배열)
+      - meta.json    : 확정된 기사 수와 컬럼 파일 크기 (마지막에 교체되어 추가 작업을 원자적으로 반영)
+    """
+
+    def __init__(self, category, data_dir=DATA_DIR):
+        self.category = category
+        self.path = os.path.join(data_dir, category.replace("/", "_"))
+
+    def exists(self):
+        return os.path.exists(self._meta_path())
+
+    def _meta_path(self):
+        return os.path.join(self.path, 'meta.json')
+
+    def _column_path(self, column, ext='jsonl'):
+        return os.path.join(self.path, f"{column}.{ext}")
+
+    def _read_meta(self):
+        if not self.exists():
+            return {'count': 0, 'sizes': {column: 0 for column in COLUMNS}}
+        with open(self._meta_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @property
+    def count(self):
+        return self._read_meta()['count']
+
+    def version(self):
+        """저장소 내용이 바뀔 때마다 달라지는 값 (캐시 키로 사용)"""
+        if not self.exists():
+            return None
+        return (self.count, os.path.getmtime(self._meta_path()))
+
+    def iter_column(self, column):
+        """한 컬럼의 값을 순서대로 하나씩 읽습니다."""
+        count = self.count
+        if count == 0:
+            return
+        with open(self._column_path(column), 'r', encoding='utf-8') as f:
+            for _, line in zip(range(count), f):
+                yield json.loads(line)
+
+    def read_column(self, column):
+        return list(self.iter_column(column))
+
+    def iter_records(self, columns=COLUMNS):
+        """지정한 컬럼만 담은 레코드(dict)를 순서대로 하나씩 읽습니다."""
+        iterators = [self.iter_column(column) for column in columns]
+        for values in zip(*iterators):
+            yield dict(zip(columns, values))
+
+    def rows(self, columns=COLUMNS):
+        """지정한 컬럼에 대한 ColumnView (필요한 행만 읽는 리스트 대용)"""
+        return ColumnView(self, columns)
+
+    def get_rows(self, indices, columns=COLUMNS):
+        """오프셋 인덱스를 이용해 지정한 행만 읽습니다."""
+        records = [{} for _ in indices]
+        for column in columns:
+            with open(self._column_path(column, 'idx'), 'rb') as idx_file, \
+                    open(self._column_path(column), 'rb') as data_file:
+                for record, index in zip(records, indices):
+                    idx_file.seek(index * OFFSET_SIZE)
+                    offset = array('Q', idx_file.read(OFFSET_SIZE))[0]
+                    data_file.seek(offset)
+                    record[column] = json.loads(data_file.readline().decode('utf-8'))
+        return records
+
+    def append(self, records):
+        """
+        레코드를 추가합니다. 확정되지 않은 이전 기록(중단된 추가 작업)은 잘라낸 뒤 이어서 씁니다.
+        :return: 추가 후 전체 기사 수
+        """
+        records = list(records)
+        with _write_lock:
+            os.makedirs(self.path, exist_ok=True)
+            meta = self._read_meta()
+            count = meta['count']
+            sizes = {}
+            for column in COLUMNS:
+                size = meta['sizes'].get(column, 0)
+                offsets = array('Q')
+                with open(self._column_path(column), 'ab+') as data_file:
+                    data_file.truncate(size)
+                    data_file.seek(size)
+                    for record in records:
+                        offsets.append(size)
+                        line = (json.dumps(record.get(column, ''), ensure_ascii=False) + '\n').encode('utf-8')
+                        data_file.write(line)
+                        size += len(line)
+                with open(self._column_path(column, 'idx'), 'ab+') as idx_file:
+                    idx_file.truncate(count * OFFSET_SIZE)
+                    idx_file.seek(count * OFFSET_SIZE)
+                    offsets.tofile(idx_file)
+                sizes[column] = size
+
+            # meta.json 교체로 추가 작업 확정
+            new_meta = {'count': count + len(records), 'sizes': sizes}
+            fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=self.path)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(new_meta, f)
+            os.replace(tmp_path, self._meta_path())
+            return new_meta['count']
+
+    def migrate_from_json(self, json_path):
+        """기존 카테고리 JSON 파일(기사 리스트)을 저장소로 옮깁니다."""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        return self.append(articles)
+
+
+def open_article_store(category, data_dir=DATA_DIR):
+    """
+    카테고리 저장소를 엽니다. 저장소가 없고 기존 JSON 파일이 있으면 한 번 변환합니다.
+    """
+    store = ArticleStore(category, data_dir)
+    json_path = category_data_path(category, data_dir)
+    with _write_lock:
+        if not store.exists() and os.path.exists(json_path):
+            store.migrate_from_json(json_path)
+    return store
@@ -1,16 +1,35 @@
-import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 import time
+from modules import metrics
+from modules.http_client import RateLimiter, create_session, request_with_retries
 
 base_url = 'https://news.naver.com'
 class NewsCrawler:
-    def __init__(self, ajax_url):
+    def __init__(self, ajax_url, base_url=base_url, max_workers=8, rate=5.0, retries=3, session=None):
+        """
+        :param ajax_url: 기사 목록 AJAX 엔드포인트
+        :param base_url: 기사 링크 앞에 붙일 주소 (테스트 서버 사용 시 변경)
+        :param max_workers: 기사 본문을 동시에 가져올 최대 스레드 수
+        :param rate: 호스트별 초당 최대 요청 수
+        :param retries: 요청 실패 시 재시도 횟수 (지수 백오프)
+        """
         self.ajax_url = ajax_url
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.retries = retries
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36',
             'Accept-Language': 'ko-KR,ko;q=0.9',
         }
+        self.session = session or create_session(pool_size=max_workers, headers=self.headers)
+        self.limiter = RateLimiter(rate=rate)
 
+    def _get(self, url, **kwargs):
+        return request_with_retries(self.session, url, limiter=self.limiter, retries=self.retries,
+                                    headers=self.headers, **kwargs)
+
+    @metrics.timed('news_list_fetch')
     def fetch_articles(self, sid, start_page=1, max_pages=5):
         articles = []
         next_value = None
@@ -24,13 +43,19 @@ class NewsCrawler:
                 'next': next_value,
                 '_': int(time.time() * 1000),
             }
-            response = requests.get(self.ajax_url, params=params, headers=self.headers)
+            # 다음 페이지 커서(data-cursor)가 이전 응답에 있으므로 목록 페이지는 순서대로 요청
+            try:
+                response = self._get(self.ajax_url, params=params)
+            except Exception as e:
+                print(f"Failed to fetch page {page_no} for sid {sid}: {e}")
+                break
 
             if response.status_code != 200:
                 print(f"Failed to fetch page {page_no} for sid {sid}: HTTP {response.status_code}")
                 break
 
             try:
+                parse_start = time.perf_counter()
                 data = response.json()
                 html_content = data.get("renderedComponent", {}).get("SECTION_ARTICLE_LIST", "")
                 soup = BeautifulSoup(html_content, 'html.parser')
@@ -44,11 +69,12 @@ class NewsCrawler:
                     oid = item.get('data-oid')  # 데이터 키 확인 필요
                     aid = item.get('data-aid')  # 데이터 키 확인 필요
 
-                    link = f"{base_url}{title_tag['href']}" if title_tag and 'href' in title_tag.attrs else "No link"
+                    link = f"{self.base_url}{title_tag['href']}" if title_tag and 'href' in title_tag.attrs else "No link"
                     articles.append({'title': title, 'link': link})
 
                 next_cursor_tag = soup.select_one('div[data-cursor]')
                 next_value = next_cursor_tag.get('data-cursor') if next_cursor_tag else None
+                metrics.observe('news_list_parse', time.perf_counter() - parse_start)
 
                 if not next_value:
                     print(f"No more pages to fetch for sid {sid}.")
@@ -61,12 +87,17 @@ class NewsCrawler:
 
     def fetch_article_content(self, url):
         """개별 기사 페이지에서 제목과 본문 크롤링"""
-        response = requests.get(url, headers=self.headers)
+        try:
+            response = self._get(url)
+        except Exception as e:
+            print(f"Error fetching article content: {e}")
+            return None
 
         if response.status_code != 200:
             return None
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with metrics.span('news_article_parse'):
+            soup = BeautifulSoup(response.text, 'html.parser')
 
         try:
             title = soup.select_one('.media_end_head_headline').get_text(strip=True)
@@ -75,3 +106,11 @@ class NewsCrawler:
         except Exception as e:
             print(f"Error parsing article content: {e}")
             return None
+
+    def fetch_article_contents(self, urls):
+        """
+        여러 기사 본문을 스레드 풀로 동시에 크롤링합니다.
+        :return: 입력 순서와 같은 순서의 결과 리스트 (실패한 기사는 None)
+        """
+        with metrics.span('news_article_fetch_all'), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.fetch_article_content, urls))
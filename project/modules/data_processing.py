@@ -1,14 +1,97 @@
 import pandas as pd
-from modules.utils import convert_price
+from modules.utils import parse_price_series
+
+# 수집 단계에서 한 번 만드는 매물 테이블의 컬럼과 타입
+LISTING_DTYPES = {
+    'dong': 'category',              # 법정동
+    'name': 'category',              # 단지명
+    'transaction_type': 'category',  # 거래 유형 (매매/전세/월세)
+    'price': 'int64',                # 가격(원)
+    'area': 'float32',               # 전용면적(㎡)
+    'floor': 'Int16',                # 현재 층 ('저/중/고'로만 표시된 매물은 결측)
+    'total_floor': 'Int16',          # 전체 층
+    'floor_info': 'category',        # 원본 층 정보 ('12/25', '저/15'), 화면 표시용
+}
+LISTING_COLUMNS = list(LISTING_DTYPES)
+
+
+def empty_listing_table():
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in LISTING_DTYPES.items()})
+
+
+def build_listing_table(apartments, dong=None):
+    """
+    get_apartments가 모은 매물 리스트(문자열 필드)를 타입이 지정된 컬럼형 테이블로 한 번에 변환합니다.
+    가격(hanPrc), 면적(spc2), 층(flrInfo)은 여기서만 파싱하고, 화면에서는 변환 없이 사용합니다.
+    가격을 변환할 수 없는 매물은 제외하고 개수를 table.attrs['rejected_prices']에 기록합니다.
+    :param apartments: {'name', 'price', 'transaction_type', 'area', 'floor'} 딕셔너리 리스트
+    :param dong: 법정동 이름 (리스트 항목에 'dong'이 없을 때 사용)
+    """
+    if not apartments:
+        table = empty_listing_table()
+        table.attrs['rejected_prices'] = 0
+        return table
+
+    raw = pd.DataFrame(apartments)
+    prices, rejected = parse_price_series(raw['price'])
+    floor_info = raw['floor'].astype('string')  # flrInfo가 없는 매물은 결측으로 유지 ('None' 문자열 방지)
+    floors = floor_info.str.extract(r'^(?P<floor>\d+)?[^/]*/(?P<total_floor>\d+)$')
+
+    table = pd.DataFrame({
+        'dong': raw['dong'] if 'dong' in raw else dong,
+        'name': raw['name'],
+        'transaction_type': raw['transaction_type'],
+        'price': prices,
+        'area': pd.to_numeric(raw['area'], errors='coerce'),
+        'floor': pd.to_numeric(floors['floor']),
+        'total_floor': pd.to_numeric(floors['total_floor']),
+        'floor_info': floor_info,
+    })
+    table = table[prices.notna()].astype(LISTING_DTYPES).reset_index(drop=True)
+    table.attrs['rejected_prices'] = rejected
+    return table
+
+
+def concat_listing_tables(tables):
+    """여러 매물 테이블을 합칩니다. (동마다 다른 범주형 카테고리를 합쳐 타입 유지)"""
+    tables = [table for table in tables if not table.empty]
+    if not tables:
+        return empty_listing_table()
+    combined = pd.concat(tables, ignore_index=True).astype(LISTING_DTYPES)
+    combined.attrs['rejected_prices'] = sum(table.attrs.get('rejected_prices', 0) for table in tables)
+    return combined
+
+
+def listing_table_to_columns(table):
+    """캐시에 저장할 수 있도록 테이블을 컬럼별 리스트(JSON)로 바꿉니다. 빈 테이블은 빈 dict."""
+    if table.empty:
+        return {}
+    columns = {column: table[column].astype(object).where(table[column].notna(), None).tolist()
+               for column in LISTING_COLUMNS}
+    columns['rejected_prices'] = table.attrs.get('rejected_prices', 0)
+    return columns
+
+
+def listing_table_from_columns(columns, dong=None):
+    """
+    listing_table_to_columns 결과를 다시 테이블로 만듭니다. (타입 지정만 하고 파싱은 하지 않음)
+    이전 형식(매물 딕셔너리 리스트)으로 캐시된 값이면 build_listing_table로 변환합니다.
+    """
+    if isinstance(columns, list):
+        return build_listing_table(columns, dong)
+    if not columns:
+        return empty_listing_table()
+    table = pd.DataFrame({column: columns[column] for column in LISTING_COLUMNS}).astype(LISTING_DTYPES)
+    table.attrs['rejected_prices'] = columns.get('rejected_prices', 0)
+    return table
+
 
 def filter_apartments_by_area(apartments, area_range):
     min_area, max_area = map(float, area_range.split('~'))
-    return [apt for apt in apartments if min_area <= float(apt['area'] or 0) < max_area]
+    area = apartments['area']
+    return apartments[(area >= min_area) & (area < max_area)]
 
 def process_apartments(apartments, area_range, transaction_type):
-    filtered_apartments = filter_apartments_by_area(apartments, area_range)
-    df = pd.DataFrame(filtered_apartments)
+    df = filter_apartments_by_area(apartments, area_range)
     df = df[df['transaction_type'] == transaction_type]
-    df['가격'] = df['price'].apply(lambda x: convert_price(x))
-    df.sort_values(by='가격', inplace=True)
-    return df
+    return df.sort_values(by='price')
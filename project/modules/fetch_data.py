@@ -1,18 +1,53 @@
 import requests
-import time
-import random
 import json
 import os
+import threading
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from modules import metrics
+from modules.data_processing import build_listing_table, listing_table_from_columns, listing_table_to_columns
+from modules.http_client import RETRY_STATUS_CODES, RateLimiter, create_session, request_with_retries
+from modules.listing_cache import ListingCache, get_listing_cache
+from modules.price_history import get_price_history
 from modules.visualization import create_dataframe, create_bar_chart
 
+ARTICLE_LIST_URL = 'https://m.land.naver.com/cluster/ajax/articleList'
+HEADERS = {
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+}
 
-def fetch_apartments(url):
-    headers = {
-        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
-    }
+# 동시에 요청할 최대 페이지 수와 초당 요청 수 (프로세스의 모든 세션이 공유)
+# 기본값은 기존 고정 대기(페이지마다 1~2초)와 같은 간격(약 1.4초에 한 번)으로 한 페이지씩 요청합니다.
+# 더 빠른 조회가 필요하면 NAVER_LAND_RPS, NAVER_LAND_CONCURRENCY 환경 변수로 명시적으로 올립니다.
+REQUESTS_PER_SECOND = float(os.environ.get('NAVER_LAND_RPS', 0.7))
+MAX_CONCURRENT_PAGES = max(1, int(os.environ.get('NAVER_LAND_CONCURRENCY', 1)))
+
+# 매물 캐시 유효 시간(초). 지나면 기존 데이터를 먼저 보여주고 백그라운드에서 갱신
+LISTING_CACHE_TTL = 600
+
+# 네이버 부동산은 요청이 많으면 리다이렉트로 차단하므로 3xx도 스로틀링으로 간주
+THROTTLE_STATUS_CODES = RETRY_STATUS_CODES | {301, 302, 307}
+
+_session = None
+_session_lock = threading.Lock()
+_limiter = RateLimiter(rate=REQUESTS_PER_SECOND, burst=MAX_CONCURRENT_PAGES)
+
+
+def get_session():
+    """커넥션을 재사용하는 공유 세션을 반환합니다."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session(pool_size=MAX_CONCURRENT_PAGES * 2, headers=HEADERS)
+        return _session
+
+
+def fetch_apartments(url, session=None, limiter=_limiter):
     try:
-        response = requests.get(url, headers=headers, allow_redirects=False, timeout=10)
+        response = request_with_retries(
+            session or get_session(), url, limiter=limiter, retries=2, timeout=10,
+            retry_statuses=THROTTLE_STATUS_CODES, allow_redirects=False
+        )
         if response.status_code != 200:
             raise Exception(f"HTTP 오류: 상태 코드 {response.status_code}")
 
@@ -20,7 +55,8 @@ def fetch_apartments(url):
             raise Exception("응답이 비어 있습니다.")
 
         try:
-            data = response.json()  # JSON 변환 시도
+            with metrics.span('apartments_json_parse'):
+                data = response.json()  # JSON 변환 시도
         except ValueError as ve:
             raise Exception("JSON 파싱 오류: 응답이 JSON 형식이 아닙니다.") from ve
 
@@ -30,12 +66,19 @@ def fetch_apartments(url):
         raise Exception(f"API 요청 중 오류가 발생했습니다: {e}")
 
 
-def get_apartments(selected_dong, dong_options, max_pages=15):
+@metrics.timed('apartments_fetch')
+def get_apartments(selected_dong, dong_options, max_pages=15, concurrency=MAX_CONCURRENT_PAGES,
+                   base_url=ARTICLE_LIST_URL, limiter=_limiter):
     """
     선택된 동의 아파트 데이터를 가져옵니다.
+    페이지는 concurrency개씩 동시에 요청하고, 결과는 페이지 순서대로 처리합니다.
+    요청 간격은 고정 대기 대신 공유 토큰 버킷(_limiter)이 조절합니다.
+    :return: 타입이 지정된 매물 테이블 (build_listing_table 참고)
+    :param base_url: articleList 엔드포인트 (테스트/벤치마크 서버 사용 시 변경)
+    :param limiter: 요청 속도 제한기 (기본값: 모든 세션이 공유하는 토큰 버킷)
     """
     url_template = (
-        'https://m.land.naver.com/cluster/ajax/articleList?rletTpCd=APT'
+        base_url + '?rletTpCd=APT'
         '&tradTpCd=A1%3AB1&z={z}&lat={lat}&lon={lon}&btm={btm}&lft={lft}'
         '&top={top}&rgt={rgt}&spcMin=66&spcMax=132&showR0=&totCnt={totCnt}'
         '&cortarNo={cortarNo}&sort=rank&page={page}'
@@ -43,35 +86,86 @@ def get_apartments(selected_dong, dong_options, max_pages=15):
     apartments = []
     seen_ids = set()  # 중복 제거를 위한 ID 저장소
 
-    for page in range(1, max_pages + 1):
-        url = url_template.format(**dong_options[selected_dong], page=page)
-        try:
-            data = fetch_apartments(url)
-            if not data.get('body'):
-                print(f"페이지 {page}: 데이터 없음.")
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for first_page in range(1, max_pages + 1, concurrency):
+            pages = range(first_page, min(first_page + concurrency, max_pages + 1))
+            futures = [
+                executor.submit(fetch_apartments, url_template.format(**dong_options[selected_dong], page=page),
+                                limiter=limiter)
+                for page in pages
+            ]
+
+            done = False
+            for page, future in zip(pages, futures):
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f"오류 발생: {e}")
+                    done = True
+                    break
+
+                if not data.get('body'):
+                    print(f"페이지 {page}: 데이터 없음.")
+                    done = True
+                    break
+
+                for item in data['body']:
+                    # 고유 ID를 기준으로 중복 검사
+                    apt_id = item.get('atclNo')  # 고유 ID
+                    if apt_id and apt_id not in seen_ids:
+                        seen_ids.add(apt_id)
+                        apartments.append({
+                            'name': item.get('atclNm', '알 수 없음'),
+                            'price': item.get('hanPrc', '정보 없음'),
+                            'transaction_type': item.get('tradTpNm', '알 수 없음'),
+                            'area': item.get('spc2', '정보 없음'),
+                            'floor': item.get('flrInfo', '정보 없음')
+                        })
+
+                print(f"페이지 {page}: {len(data['body'])}개의 데이터 수집 완료.")
+                if data.get('more') is False:
+                    done = True  # 마지막 페이지
+                    break
+
+            if done:
+                for future in futures:
+                    future.cancel()
                 break
 
-            for item in data['body']:
-                # 고유 ID를 기준으로 중복 검사
-                apt_id = item.get('atclNo')  # 고유 ID
-                if apt_id and apt_id not in seen_ids:
-                    seen_ids.add(apt_id)
-                    apartments.append({
-                        'name': item.get('atclNm', '알 수 없음'),
-                        'price': item.get('hanPrc', '정보 없음'),
-                        'transaction_type': item.get('tradTpNm', '알 수 없음'),
-                        'area': item.get('spc2', '정보 없음'),
-                        'floor': item.get('flrInfo', '정보 없음')
-                    })
-
-            print(f"페이지 {page}: {len(data['body'])}개의 데이터 수집 완료.")
-            time.sleep(random.uniform(1, 2))  # 요청 간 간격 두기
+    print(f"총 {len(apartments)}개의 아파트 데이터 수집 완료.")
+    with metrics.span('listing_table_build'):
+        return build_listing_table(apartments, dong=selected_dong)
 
-        except Exception as e:
-            print(f"오류 발생: {e}")
-            break
 
-    print(f"총 {len(apartments)}개의 아파트 데이터 수집 완료.")
+def get_apartments_cached(selected_dong, dong_options, max_pages=15, ttl=LISTING_CACHE_TTL):
+    """
+    매물 캐시를 거쳐 선택된 동의 아파트 데이터를 가져옵니다.
+    캐시 키는 cortarNo와 조회 파라미터이며, 모든 탭/세션이 같은 캐시를 사용합니다.
+    캐시에는 매물 테이블을 컬럼별 리스트로 저장하므로 읽을 때 다시 파싱하지 않습니다.
+    :return: 타입이 지정된 매물 테이블
+    """
+    options = dong_options[selected_dong]
+    key = ListingCache.make_key(options['cortarNo'], dict(options, max_pages=max_pages))
+    with metrics.span('apartments_cached'):
+        columns = get_listing_cache().get_or_fetch(
+            key,
+            lambda: listing_table_to_columns(fetch_and_record_apartments(selected_dong, dong_options, max_pages)),
+            ttl=ttl
+        )
+        return listing_table_from_columns(columns, dong=selected_dong)
+
+
+def fetch_and_record_apartments(selected_dong, dong_options, max_pages=15):
+    """
+    아파트 데이터를 새로 가져와 가격 이력 저장소에 스냅샷으로 기록합니다.
+    """
+    apartments = get_apartments(selected_dong, dong_options, max_pages=max_pages)
+    if not apartments.empty:
+        try:
+            with metrics.span('price_history_record'):
+                get_price_history().record_snapshot(selected_dong, apartments)
+        except Exception as e:
+            print(f"가격 이력 저장 중 오류 발생: {e}")
     return apartments
 
 
@@ -106,7 +200,7 @@ def render_real_estate_page():
             st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {e}")
             return
 
-        if apartments:
+        if not apartments.empty:
             # 데이터프레임 생성
             filtered_df = create_dataframe(apartments, data_type)
 
@@ -116,7 +210,7 @@ def render_real_estate_page():
 
                 # 바 차트 생성
                 chart = create_bar_chart(filtered_df, f"{data_type} 아파트 가격")
-                if chart:
+                if chart is not None:
                     st.altair_chart(chart, use_container_width=True)
                 else:
                     st.warning("차트를 생성할 수 있는 데이터가 없습니다.")
@@ -0,0 +1,134 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from modules import metrics
+
+# 재시도 대상 HTTP 상태 코드 (스로틀링 및 일시적인 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def create_session(pool_size=10, headers=None):
+    """
+    커넥션을 재사용(keep-alive)하는 requests 세션을 생성합니다.
+    :param pool_size: 호스트별로 유지할 최대 커넥션 수 (동시 요청 수 이상으로 설정)
+    :param headers: 모든 요청에 붙일 기본 헤더
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class RateLimiter:
+    """
+    호스트별 토큰 버킷 요청 속도 제한기입니다.
+    오류나 스로틀링 응답이 오면 해당 호스트 요청을 잠시 멈추고, 대기 시간을 지수적으로 늘립니다.
+    """
+
+    def __init__(self, rate=5.0, burst=None, max_backoff=30.0):
+        """
+        :param rate: 호스트별 초당 요청 수
+        :param burst: 한 번에 보낼 수 있는 최대 요청 수 (기본값: rate)
+        :param max_backoff: 최대 대기 시간(초)
+        """
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.max_backoff = max_backoff
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url, now):
+        host = urlparse(url).netloc
+        return self._buckets.setdefault(host, {'tokens': self.burst, 'updated': now, 'backoff': 0.0, 'blocked_until': 0.0})
+
+    def acquire(self, url):
+        """요청을 보낼 수 있을 때까지 대기합니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                bucket = self._bucket(url, now)
+                if now < bucket['blocked_until']:
+                    wait = bucket['blocked_until'] - now
+                else:
+                    bucket['tokens'] = min(self.burst, bucket['tokens'] + (now - bucket['updated']) * self.rate)
+                    bucket['updated'] = now
+                    if bucket['tokens'] >= 1:
+                        bucket['tokens'] -= 1
+                        return
+                    wait = (1 - bucket['tokens']) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, url, retry_after=None):
+        """
+        오류/스로틀링 응답 후 호출: 호스트 요청을 대기 시간만큼 멈춥니다.
+        서버가 보낸 Retry-After도 max_backoff까지만 따릅니다. (버킷은 모든 세션이 공유하므로)
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(url, now)
+            bucket['backoff'] = min(self.max_backoff, max(1.0, bucket['backoff'] * 2))
+            delay = bucket['backoff'] if retry_after is None else min(self.max_backoff, max(0.0, retry_after))
+            bucket['blocked_until'] = max(bucket['blocked_until'], now + delay)
+            bucket['tokens'] = 0
+
+    def reward(self, url):
+        """정상 응답 후 호출: 누적된 대기 시간을 점차 줄입니다."""
+        with self._lock:
+            bucket = self._bucket(url, time.monotonic())
+            bucket['backoff'] /= 2
+
+
+def _retry_after_seconds(response):
+    """Retry-After 헤더(초 단위)를 읽습니다. 없거나 형식이 다르면 None."""
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def request_with_retries(session, url, limiter=None, retries=3, backoff=0.5, timeout=10,
+                         retry_statuses=RETRY_STATUS_CODES, **kwargs):
+    """
+    GET 요청을 보내고, 연결 오류나 재시도 대상 상태 코드면 지수 백오프로 다시 시도합니다.
+    :param session: requests 세션
+    :param limiter: RateLimiter (None이면 속도 제한 없음)
+    :param retries: 최대 재시도 횟수
+    :param backoff: 첫 재시도 대기 시간(초), 이후 두 배씩 증가
+    :param retry_statuses: 재시도(및 호스트 대기) 대상 상태 코드
+    :return: 마지막 응답 (재시도를 모두 소진하면 마지막 오류 응답을 반환하거나 예외 발생)
+    """
+    host = urlparse(url).netloc
+    for attempt in range(retries + 1):
+        if limiter:
+            with metrics.span('http_rate_limit_wait', host=host):
+                limiter.acquire(url)
+
+        response, error = None, None
+        try:
+            with metrics.span('http_request', host=host):
+                response = session.get(url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        metrics.inc('http_requests', host=host, status=response.status_code if response is not None else 'error')
+
+        if response is not None and response.status_code not in retry_statuses:
+            if limiter:
+                limiter.reward(url)
+            return response
+
+        if limiter:
+            limiter.penalize(url, _retry_after_seconds(response))
+        if attempt == retries:
+            if response is not None:
+                return response
+            raise error
+        metrics.inc('http_retries', host=host)
+        with metrics.span('http_retry_sleep', host=host):
+            time.sleep(backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
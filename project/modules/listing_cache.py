@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from modules import metrics
+from modules.paths import CACHE_DIR
+
+
+class ListingCache:
+    """
+    매물 목록 조회 결과를 SQLite에 저장하는 TTL 캐시입니다.
+    TTL이 지난 항목은 즉시 반환하고, 백그라운드에서 새로 가져와 갱신합니다. (stale-while-revalidate)
+    파일에 저장되므로 탭, 세션, 서버 재시작 사이에 공유됩니다.
+    """
+
+    def __init__(self, path=None, ttl=600):
+        """
+        :param path: SQLite 파일 경로 (기본값: cache/listings.sqlite3)
+        :param ttl: 항목을 신선하다고 보는 시간(초)
+        """
+        self.path = path or os.path.join(CACHE_DIR, 'listings.sqlite3')
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS listings (key TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(cortar_no, params):
+        """cortarNo와 조회 파라미터로 캐시 키를 만듭니다."""
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{cortar_no}:{digest}"
+
+    def get(self, key):
+        """:return: (값, 저장 시각) 또는 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT payload, fetched_at FROM listings WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO listings (key, payload, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def get_or_fetch(self, key, fetch, ttl=None):
+        """
+        캐시된 값을 반환합니다.
+        - 없으면 fetch()로 가져와 저장 후 반환
+        - TTL이 지났으면 기존 값을 바로 반환하고 백그라운드에서 갱신
+        빈 결과는 (차단/오류일 수 있으므로) 저장하지 않습니다.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        entry = self.get(key)
+        if entry is None:
+            metrics.inc('cache_misses', cache='listings')
+            value = fetch()
+            if value:
+                self.put(key, value)
+            return value
+
+        value, fetched_at = entry
+        metrics.inc('cache_hits', cache='listings')
+        if time.time() - fetched_at > ttl:
+            metrics.inc('cache_stale', cache='listings')
+            self._refresh_in_background(key, fetch)
+        return value
+
+    def _refresh_in_background(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return  # 이미 갱신 중
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = fetch()
+                if value:
+                    self.put(key, value)
+            except Exception as e:
+                print(f"캐시 갱신 중 오류 발생 ({key}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"listing-refresh-{key}", daemon=True).start()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_listing_cache():
+    """프로세스 전체에서 공유하는 기본 매물 캐시를 반환합니다."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ListingCache()
+        return _default_cache
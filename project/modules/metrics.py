@@ -0,0 +1,166 @@
+import collections
+import contextlib
+import functools
+import os
+import re
+import tempfile
+import threading
+import time
+from modules.paths import CACHE_DIR
+
+# Prometheus textfile collector(node_exporter)가 읽을 파일 경로
+METRICS_TEXTFILE = os.environ.get('METRICS_TEXTFILE', os.path.join(CACHE_DIR, 'metrics.prom'))
+METRIC_PREFIX = 'newsapp'
+
+
+class Metrics:
+    """
+    단계별 소요 시간(span)과 카운터를 모으는 가벼운 프로세스 내 수집기입니다.
+    - span: 단계 이름(+레이블)별 횟수/합계/최대/마지막 소요 시간
+    - counter: HTTP 요청 수, 재시도 수, 캐시 적중/미스 등 누적 값
+    """
+
+    def __init__(self, recent=500):
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._counters = collections.Counter()
+        self._recent = collections.deque(maxlen=recent)
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def observe(self, name, seconds, **labels):
+        """단계 소요 시간을 기록합니다."""
+        key = self._key(name, labels)
+        with self._lock:
+            stats = self._spans.setdefault(key, {'count': 0, 'sum': 0.0, 'max': 0.0, 'last': 0.0})
+            stats['count'] += 1
+            stats['sum'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['last'] = seconds
+            self._recent.append((time.time(), name, dict(key[1]), seconds))
+
+    @contextlib.contextmanager
+    def span(self, name, **labels):
+        """with 블록의 소요 시간을 name 단계로 기록합니다. (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def inc(self, name, value=1, **labels):
+        """카운터를 value만큼 증가시킵니다."""
+        with self._lock:
+            self._counters[self._key(name, labels)] += value
+
+    def snapshot(self):
+        """
+        :return: {'spans': [{name, labels, count, sum, max, last}], 'counters': [{name, labels, value}],
+                  'recent': [(시각, 이름, 레이블, 초)]}
+        """
+        with self._lock:
+            spans = [dict(stats, name=name, labels=dict(labels)) for (name, labels), stats in self._spans.items()]
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in self._counters.items()]
+            recent = list(self._recent)
+        return {'spans': sorted(spans, key=lambda s: s['name']),
+                'counters': sorted(counters, key=lambda c: c['name']),
+                'recent': recent}
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self._recent.clear()
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식 (exposition format)으로 변환합니다."""
+        snapshot = self.snapshot()
+        lines = []
+        stage = f'{METRIC_PREFIX}_stage_seconds'
+        if snapshot['spans']:
+            lines += [f'# HELP {stage} 단계별 소요 시간(초)', f'# TYPE {stage} summary']
+            for span in snapshot['spans']:
+                labels = dict(span['labels'], stage=span['name'])
+                lines.append(f"{stage}_sum{_format_labels(labels)} {span['sum']:.6f}")
+                lines.append(f"{stage}_count{_format_labels(labels)} {span['count']}")
+            lines += [f'# HELP {stage}_max 단계별 최대 소요 시간(초)', f'# TYPE {stage}_max gauge']
+            for span in snapshot['spans']:
+                labels = dict(span['labels'], stage=span['name'])
+                lines.append(f"{stage}_max{_format_labels(labels)} {span['max']:.6f}")
+
+        by_name = collections.defaultdict(list)
+        for counter in snapshot['counters']:
+            by_name[counter['name']].append(counter)
+        for name, counters in sorted(by_name.items()):
+            metric = f"{METRIC_PREFIX}_{_sanitize(name)}_total"
+            lines.append(f'# TYPE {metric} counter')
+            for counter in counters:
+                lines.append(f"{metric}{_format_labels(counter['labels'])} {counter['value']}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path=METRICS_TEXTFILE):
+        """Prometheus textfile collector용 파일을 원자적으로 교체합니다."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.prom', dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+
+def _sanitize(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{_sanitize(key)}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+# 프로세스 전체에서 공유하는 기본 수집기
+metrics = Metrics()
+span = metrics.span
+observe = metrics.observe
+inc = metrics.inc
+snapshot = metrics.snapshot
+
+_last_export = 0.0
+_export_lock = threading.Lock()
+
+
+def timed(name, **labels):
+    """함수 실행 시간을 name 단계로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def export_textfile(path=METRICS_TEXTFILE, min_interval=15.0):
+    """
+    Prometheus 텍스트 파일을 기록합니다. 페이지를 그릴 때마다 호출해도 min_interval초에 한 번만 씁니다.
+    :return: 기록한 경로 (건너뛰었거나 실패하면 None)
+    """
+    global _last_export
+    with _export_lock:
+        now = time.monotonic()
+        if now - _last_export < min_interval:
+            return None
+        _last_export = now
+    try:
+        return metrics.write_textfile(path)
+    except OSError as e:
+        print(f"메트릭 파일 기록 중 오류 발생: {e}")
+        return None
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
+from gensim import corpora
+from gensim.models import LdaModel
+from modules.paths import MODEL_DIR
+
+# 중단된 작업이 남긴 임시 디렉터리(.tmp-*)는 이 시간(초)이 지나면 정리
+STALE_TMP_AGE = 24 * 3600
+
+_swept_dirs = set()
+_swept_dirs_lock = threading.Lock()
+
+
+def sweep_stale_temp_dirs(directory, max_age=STALE_TMP_AGE):
+    """
+    프로세스가 학습/저장 중에 종료되어 남은 .tmp-* 항목을 지웁니다. 디렉터리마다 프로세스당 한 번만 확인하며,
+    다른 프로세스가 아직 쓰고 있을 수 있으므로 max_age초보다 오래된 항목만 삭제합니다.
+    """
+    with _swept_dirs_lock:
+        if directory in _swept_dirs:
+            return
+        _swept_dirs.add(directory)
+    if not os.path.isdir(directory):
+        return
+    now = time.time()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if not name.startswith('.tmp-') or now - os.path.getmtime(path) < max_age:
+                continue
+        except OSError:
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def corpus_fingerprint(texts, **params):
+    """
+    카테고리 텍스트와 LDA 파라미터로부터 모델 키(해시)를 생성합니다.
+    :param texts: 문서 텍스트 리스트 (processed_body)
+    :param params: 학습/라벨 생성 파라미터
+    :return: SHA-256 16진수 문자열
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(params, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')  # 문서 경계 구분
+    return digest.hexdigest()
+
+
+def document_key(text):
+    """개별 문서(processed_body)의 내용 해시. 어떤 문서가 모델에 반영되었는지 추적하는 데 사용합니다."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ModelStore:
+    """
+    학습된 LDA 모델, 사전, 코퍼스, 토픽 라벨을 디스크에 저장하고 불러옵니다.
+    저장 경로: <root>/<카테고리>/<키>/
+    """
+
+    def __init__(self, root=MODEL_DIR):
+        self.root = root
+
+    def category_dir(self, category):
+        return os.path.join(self.root, category.replace("/", "_"))
+
+    def artifact_dir(self, category, key):
+        return os.path.join(self.category_dir(category), key)
+
+    def exists(self, category, key):
+        return os.path.exists(os.path.join(self.artifact_dir(category, key), 'meta.json'))
+
+    def save(self, category, key, lda_model, dictionary, corpus, topic_labels, meta=None, doc_keys=None,
+             doc_topics=None, wordclouds=None):
+        """
+        모델 산출물을 임시 디렉터리에 기록한 뒤 이름 변경으로 한 번에 반영합니다.
+        :param doc_keys: 모델에 반영된 문서들의 document_key 리스트 (증분 학습에 사용)
+        :param doc_topics: (문서 수, 토픽 수) 문서-토픽 분포 행렬 (관련 기사 조회에 사용)
+        :param wordclouds: 토픽별 워드클라우드 PNG 바이트 리스트
+        """
+        category_dir = self.category_dir(category)
+        os.makedirs(category_dir, exist_ok=True)
+        sweep_stale_temp_dirs(category_dir)
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=category_dir)
+        try:
+            lda_model.save(os.path.join(tmp_dir, 'lda.model'))
+            dictionary.save(os.path.join(tmp_dir, 'dictionary.dict'))
+            self._write_corpus(os.path.join(tmp_dir, 'corpus.mm'), corpus)
+            with open(os.path.join(tmp_dir, 'topic_labels.json'), 'w', encoding='utf-8') as f:
+                json.dump(topic_labels, f, ensure_ascii=False)
+            with open(os.path.join(tmp_dir, 'documents.json'), 'w', encoding='utf-8') as f:
+                json.dump(doc_keys or [], f)
+            if doc_topics is not None:
+                np.save(os.path.join(tmp_dir, 'doc_topics.npy'), doc_topics)
+            self._write_wordclouds(tmp_dir, wordclouds or [])
+
+            # meta.json은 마지막에 기록 (존재 여부로 저장 완료를 판단)
+            meta = dict(meta or {}, key=key, category=category, created_at=time.time())
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            target_dir = self.artifact_dir(category, key)
+            if os.path.exists(target_dir):
+                shutil.rmtree(target_dir)
+            os.rename(tmp_dir, target_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return target_dir
+
+    def load(self, category, key):
+        """
+        저장된 산출물을 불러옵니다. 없으면 None을 반환합니다.
+        코퍼스는 메모리에 올리지 않고 디스크에서 스트리밍하는 MmCorpus로 반환합니다.
+        :return: lda_model, corpus, dictionary, topic_labels, meta, doc_keys, doc_topics를 담은 딕셔너리
+        """
+        if not self.exists(category, key):
+            return None
+
+        path = self.artifact_dir(category, key)
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(path, 'topic_labels.json'), 'r', encoding='utf-8') as f:
+            topic_labels = json.load(f)
+
+        doc_keys = []
+        if os.path.exists(os.path.join(path, 'documents.json')):
+            with open(os.path.join(path, 'documents.json'), 'r', encoding='utf-8') as f:
+                doc_keys = json.load(f)
+
+        doc_topics = None
+        if os.path.exists(os.path.join(path, 'doc_topics.npy')):
+            doc_topics = np.load(os.path.join(path, 'doc_topics.npy'))
+
+        return {
+            'lda_model': LdaModel.load(os.path.join(path, 'lda.model')),
+            'dictionary': corpora.Dictionary.load(os.path.join(path, 'dictionary.dict')),
+            'corpus': corpora.MmCorpus(os.path.join(path, 'corpus.mm')),
+            'topic_labels': topic_labels,
+            'meta': meta,
+            'doc_keys': doc_keys,
+            'doc_topics': doc_topics,
+        }
+
+    def load_corpus(self, category, key):
+        """저장된 코퍼스를 디스크에서 스트리밍하는 MmCorpus로 엽니다."""
+        return corpora.MmCorpus(os.path.join(self.artifact_dir(category, key), 'corpus.mm'))
+
+    @staticmethod
+    def _write_corpus(path, corpus):
+        """이미 Matrix Market 파일로 기록된 코퍼스는 파일(과 오프셋 인덱스)을 복사하고, 아니면 직렬화합니다."""
+        source = getattr(corpus, 'input', None) if isinstance(corpus, corpora.MmCorpus) else None
+        if isinstance(source, str) and os.path.exists(source):
+            shutil.copyfile(source, path)
+            if os.path.exists(source + '.index'):
+                shutil.copyfile(source + '.index', path + '.index')
+        else:
+            corpora.MmCorpus.serialize(path, corpus)
+
+    def load_wordclouds(self, category, key, num_topics):
+        """
+        저장된 토픽별 워드클라우드 PNG를 읽습니다.
+        :return: PNG 바이트 리스트 (하나라도 없으면 None)
+        """
+        images = []
+        for topic_id in range(num_topics):
+            path = os.path.join(self.artifact_dir(category, key), f'wordcloud_{topic_id}.png')
+            if not os.path.exists(path):
+                return None
+            with open(path, 'rb') as f:
+                images.append(f.read())
+        return images
+
+    def save_wordclouds(self, category, key, wordclouds):
+        """이미 저장된 산출물에 워드클라우드 PNG를 추가합니다. (이전 버전 산출물 보완용)"""
+        if self.exists(category, key):
+            self._write_wordclouds(self.artifact_dir(category, key), wordclouds)
+
+    @staticmethod
+    def _write_wordclouds(path, wordclouds):
+        for topic_id, image in enumerate(wordclouds):
+            if image is None:
+                continue
+            fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=path)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(image)
+            os.replace(tmp_path, os.path.join(path, f'wordcloud_{topic_id}.png'))
+
+    def latest(self, category, **match):
+        """
+        카테고리의 가장 최근 산출물 키를 반환합니다.
+        :param match: meta에서 값이 일치해야 하는 항목 (예: num_topics=5)
+        :return: 키 문자열 또는 None
+        """
+        for _, name in self._entries(category):
+            with open(os.path.join(self.category_dir(category), name, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if all(meta.get(field) == value for field, value in match.items()):
+                return name
+        return None
+
+    def prune(self, category, keep=3):
+        """
+        카테고리별로 최근 `keep`개의 산출물만 남기고 삭제합니다.
+        """
+        for _, name in self._entries(category)[keep:]:
+            shutil.rmtree(os.path.join(self.category_dir(category), name), ignore_errors=True)
+
+    def _entries(self, category):
+        """(meta.json 수정 시각, 키) 목록을 최신순으로 반환합니다."""
+        category_dir = self.category_dir(category)
+        if not os.path.isdir(category_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(category_dir):
+            meta_path = os.path.join(category_dir, name, 'meta.json')
+            if os.path.exists(meta_path):
+                entries.append((os.path.getmtime(meta_path), name))
+        return sorted(entries, reverse=True)
@@ -1,71 +1,208 @@
 import streamlit as st
-import json
 import os
+import queue
 import re
-from modules.visualization import generate_wordcloud_image, display_related_articles
-from modules.topic_modeling import preprocess_data, perform_lda, generate_topic_labels_with_context
+import threading
+from modules import metrics
+from modules.visualization import display_related_articles, metrics_debug_enabled, render_metrics_panel
+from modules.topic_modeling import load_or_train_topic_model, load_topic_wordclouds
+from modules.paths import category_data_path
+from modules.article_store import ArticleStore, open_article_store
+from modules.search_index import search_articles
 
-# 데이터 디렉토리와 카테고리 설정
-DATA_DIR = "data"
+# 카테고리 설정
 CATEGORIES = ["정치", "경제", "사회", "생활/문화", "IT/과학", "세계"]
+SEARCH_RESULTS = 20  # 검색 결과 최대 표시 개수
 
-def render_naver_news_page():
+# LDA 학습 및 토픽 라벨 생성 파라미터 (변경 시 모델을 다시 학습)
+# workers: 2 이상이면 멀티코어 학습, tol: 설정하면 수렴 시 passes 이전에 조기 종료
+# convergence: 수렴 판단 기준 ("perplexity" 또는 "topics")
+# incremental: 데이터가 갱신되면 이전 모델에 새 기사만 반영, history_half_life: 기존 기사 영향력 반감기(일)
+# no_below/no_above/keep_n: 어휘 정리 기준 (최소 문서 수, 최대 문서 비율, 최대 단어 수)
+# chunksize: 학습 시 디스크 코퍼스에서 한 번에 읽는 문서 수
+LDA_PARAMS = {"num_topics": 5, "passes": 15, "workers": None, "tol": None, "convergence": "perplexity",
+              "incremental": False, "history_half_life": None,
+              "no_below": 2, "no_above": 0.5, "keep_n": 50000, "chunksize": 2000}
+LABEL_PARAMS = {"topn": 5, "language": "kor"}
+
+# 백그라운드 워밍업 상태 (프로세스 내 모든 세션이 공유)
+_warmup_queue = queue.Queue()
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+_warmup_pending = set()
+_warmed_up = {}  # 카테고리 -> 워밍업 당시 기사 저장소 버전
+
+
+@st.cache_resource(show_spinner="토픽 모델을 불러오는 중...", max_entries=2 * len(CATEGORIES))
+def get_topic_model(category, data_version):
     """
-    네이버 뉴스 페이지를 렌더링합니다.
+    카테고리의 LDA 산출물을 불러옵니다. (디스크 저장소 + 프로세스 메모리 캐시)
+    data_version(기사 저장소 버전)이 바뀌면 캐시를 무시하고 저장소에서 다시 확인합니다.
     """
-    st.title("📰 네이버 뉴스")
+    with metrics.span('article_store_read', category=category):
+        category_texts = open_article_store(category).read_column('processed_body')
+    return load_or_train_topic_model(category, category_texts, **LDA_PARAMS, **LABEL_PARAMS)
 
-    # 카테고리를 탭으로 생성
-    tabs = st.tabs(CATEGORIES)
 
-    for tab, category in zip(tabs, CATEGORIES):
-        with tab:
-            st.subheader(f"{category} 카테고리 분석")
+@st.cache_resource(max_entries=2 * len(CATEGORIES))
+def get_topic_wordclouds(category, model_key, _artifacts):
+    """
+    토픽별 워드클라우드 PNG를 불러옵니다. 모델 저장 시 미리 생성되므로 토픽을 바꿀 때 다시 그리지 않습니다.
+    model_key가 같으면 (같은 모델이면) 메모리에 캐시된 이미지를 사용합니다.
+    """
+    with metrics.span('wordcloud_load', category=category):
+        return load_topic_wordclouds(category, _artifacts)
 
-            # 파일명 변환 (슬래시를 언더스코어로 대체)
-            sanitized_category = category.replace("/", "_")
-            file_path = os.path.join(DATA_DIR, f"{sanitized_category}.json")
 
-            # 데이터 로드
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    articles = json.load(f)  # 기사 데이터 로드
+def schedule_warmup(categories):
+    """
+    선택되지 않은 카테고리의 토픽 모델을 백그라운드에서 미리 학습/저장하도록 예약합니다.
+    이미 최신 데이터로 준비된 카테고리는 건너뜁니다.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        for category in categories:
+            if category in _warmup_pending:
+                continue
+            store = ArticleStore(category)
+            if not store.exists() and not os.path.exists(category_data_path(category)):
+                continue
+            if store.exists() and _warmed_up.get(category) == store.version():
+                continue
+            _warmup_pending.add(category)
+            _warmup_queue.put(category)
+
+        if _warmup_pending and (_warmup_thread is None or not _warmup_thread.is_alive()):
+            _warmup_thread = threading.Thread(target=_warmup_worker, name="topic-warmup", daemon=True)
+            _warmup_thread.start()
+
+
+def _warmup_worker():
+    """워밍업 큐를 하나씩 처리합니다. 큐가 비면 종료합니다."""
+    global _warmup_thread
+    while True:
+        try:
+            category = _warmup_queue.get(timeout=1)
+        except queue.Empty:
+            with _warmup_lock:
+                if _warmup_queue.empty():
+                    _warmup_thread = None
+                    return
+            continue
+
+        try:
+            store = open_article_store(category)
+            data_version = store.version()
+            load_or_train_topic_model(category, store.read_column('processed_body'), **LDA_PARAMS, **LABEL_PARAMS)
+            with _warmup_lock:
+                _warmed_up[category] = data_version
+        except Exception as e:
+            print(f"{category} 워밍업 중 오류 발생: {e}")
+        finally:
+            with _warmup_lock:
+                _warmup_pending.discard(category)
+
+
+def render_category(category):
+    """
+    한 카테고리의 토픽 분석 결과를 렌더링합니다.
+    """
+    st.subheader(f"{category} 카테고리 분석")
 
-                # 텍스트 데이터 전처리
-                category_texts = [article['processed_body'] for article in articles]
-                tokenized_texts = preprocess_data(category_texts)
+    sanitized_category = category.replace("/", "_")
 
-                # LDA 모델 학습
-                lda_model, corpus, dictionary, topics = perform_lda(tokenized_texts, num_topics=5, passes=15)
+    # 기사 저장소 열기 (본문 전체를 읽지 않고 필요한 컬럼만 사용)
+    store = open_article_store(category)
+    if not store.exists():
+        st.error(f"{category} 데이터를 찾을 수 없습니다.")
+        return
+    articles = store.rows(('title', 'link'))
 
-                # WordNet/KorLex 기반으로 자연스러운 주제 생성
-                topic_labels = generate_topic_labels_with_context(lda_model, num_topics=5, topn=5, language="kor")
+    # LDA 모델 로드 (데이터/파라미터가 바뀐 경우에만 재학습)
+    with metrics.span('topic_model', category=category):
+        artifacts = get_topic_model(category, store.version())
+    lda_model = artifacts['lda_model']
+    corpus = artifacts['corpus']
+    topic_labels = artifacts['topic_labels']
 
-                # 토픽 선택 (주제 표시)
-                selected_topic_label = st.selectbox(
-                    "토픽을 선택하세요:",
-                    topic_labels,
-                    key=f"{sanitized_category}_topic_selectbox"
-                )
+    # 토픽 선택 (주제 표시)
+    selected_topic_label = st.selectbox(
+        "토픽을 선택하세요:",
+        topic_labels,
+        key=f"{sanitized_category}_topic_selectbox"
+    )
+
+    if selected_topic_label:
+        # 선택한 토픽 ID 추출
+        topic_id = int(re.search(r'\d+', selected_topic_label).group()) - 1
+
+        # 워드클라우드 표시 (모델과 함께 저장된 이미지)
+        #st.markdown("### 워드클라우드")
+        wordclouds = get_topic_wordclouds(category, artifacts['meta']['key'], artifacts)
+        wordcloud_image = wordclouds[topic_id] if wordclouds else None
+
+        if wordcloud_image:
+            st.image(wordcloud_image, use_column_width=True)
+        else:
+            st.warning("워드클라우드를 생성할 수 없습니다. 한글 폰트가 없으면 WORDCLOUD_FONT 환경 변수로 폰트 경로를 지정하세요.")
+
+        # 관련 기사 표시
+        #st.markdown("### 관련 기사")
+        with metrics.span('related_articles', category=category):
+            display_related_articles(lda_model, corpus, topic_id, articles, doc_topics=artifacts['doc_topics'])
+
+
+def render_search():
+    """
+    검색창을 렌더링합니다. 모든 카테고리의 BM25 색인으로 검색하며 토픽 모델은 사용하지 않습니다.
+    """
+    query = st.text_input("기사 검색", placeholder="검색어를 입력하세요 (예: 반도체 수출)", key="news_search")
+    if not query.strip():
+        return
+
+    try:
+        hits = search_articles(query, CATEGORIES, topn=SEARCH_RESULTS)
+    except Exception as e:
+        st.error(f"검색 중 오류가 발생했습니다: {e}")
+        return
+
+    if not hits:
+        st.info("검색 결과가 없습니다.")
+        return
+    st.caption(f"검색 결과 {len(hits)}건")
+    for hit in hits:
+        st.markdown(f"- [{hit['category']}] [{hit['title']}]({hit['link']})")
+
+
+def render_naver_news_page(lazy=True):
+    """
+    네이버 뉴스 페이지를 렌더링합니다.
+    :param lazy: True이면 선택한 카테고리만 계산하고 나머지는 백그라운드에서 준비합니다.
+                 False이면 모든 카테고리를 탭으로 한 번에 계산합니다.
+    """
+    st.title("📰 네이버 뉴스")
+    render_search()
 
-                if selected_topic_label:
-                    # 선택한 토픽 ID 추출
-                    topic_id = int(re.search(r'\d+', selected_topic_label).group()) - 1
+    if not lazy:
+        # 카테고리를 탭으로 생성 (모든 탭의 내용이 매 실행마다 계산됨)
+        tabs = st.tabs(CATEGORIES)
+        for tab, category in zip(tabs, CATEGORIES):
+            with tab:
+                render_category(category)
+        return
 
-                    # 워드클라우드 생성 및 표시 (이미지 기반)
-                    #st.markdown("### 워드클라우드")
-                    wordcloud_image = generate_wordcloud_image(
-                        lda_model, dictionary, topic_id, font_path="/Library/Fonts/AppleGothic.ttf"
-                    )
+    # 선택한 카테고리만 계산
+    selected_category = st.radio("카테고리를 선택하세요:", CATEGORIES, horizontal=True, key="news_category")
 
-                    if wordcloud_image:
-                        st.image(wordcloud_image, use_column_width=True)
-                    else:
-                        st.error("워드클라우드를 생성할 수 없습니다.")
+    # 나머지 카테고리는 백그라운드 워밍업 큐에 등록
+    schedule_warmup([category for category in CATEGORIES if category != selected_category])
+    with _warmup_lock:
+        pending = [category for category in CATEGORIES if category in _warmup_pending]
+    if pending:
+        st.caption(f"백그라운드에서 준비 중인 카테고리: {', '.join(pending)}")
 
-                    # 관련 기사 표시
-                    #st.markdown("### 관련 기사")
-                    display_related_articles(lda_model, corpus, topic_id, articles)
+    with metrics.span('news_page_render'):
+        render_category(selected_category)
 
-            else:
-                st.error(f"{category} 데이터를 찾을 수 없습니다.")
+    if metrics_debug_enabled():
+        render_metrics_panel()
@@ -0,0 +1,172 @@
+# 거의 같은 기사(통신사 기사 재전송 등) 판별: processed_body 셰이글의 MinHash 서명 + LSH 밴딩
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+import numpy as np
+from modules import metrics
+from modules.paths import CACHE_DIR
+
+NUM_PERM = 128        # MinHash 서명 길이
+BANDS = 16            # LSH 밴드 수 (밴드당 NUM_PERM // BANDS 행) -> 자카드 유사도 약 0.7 이상이 후보가 됨
+SHINGLE_SIZE = 3      # 연속 토큰 몇 개를 하나의 셰이글로 볼지
+THRESHOLD = 0.8       # 추정 자카드 유사도가 이 값 이상이면 중복으로 판단
+
+_PRIME = 4294967311   # 2^32보다 큰 가장 작은 소수 (a*x + b가 uint64 범위를 넘지 않음)
+_rng = np.random.RandomState(20250101)  # 저장된 서명과 비교해야 하므로 순열은 항상 같아야 함
+_PERM_A = _rng.randint(1, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingles(processed_body, size=SHINGLE_SIZE):
+    """processed_body(공백으로 이은 형태소)를 연속 토큰 셰이글 집합으로 바꿉니다."""
+    tokens = [word for word in (processed_body or '').split() if len(word) > 1]
+    if len(tokens) < size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash_signature(processed_body):
+    """
+    MinHash 서명을 계산합니다.
+    :return: uint32 배열 (길이 NUM_PERM), 셰이글이 없으면 None
+    """
+    items = shingles(processed_body)
+    if not items:
+        return None
+    # 파이썬 hash()는 실행마다 달라지므로 crc32 사용
+    hashes = np.fromiter((zlib.crc32(item.encode('utf-8')) for item in items), dtype=np.uint64, count=len(items))
+    values = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+    return (values.min(axis=1) & 0xFFFFFFFF).astype(np.uint32)
+
+
+def band_keys(signature, bands=BANDS):
+    """서명을 밴드로 나눠 밴드별 버킷 키(부호 있는 64비트 정수)를 만듭니다."""
+    keys = []
+    for band, rows in enumerate(np.split(signature, bands)):
+        digest = hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def estimated_similarity(signature_a, signature_b):
+    """두 서명이 일치하는 비율 (자카드 유사도 추정값)"""
+    return float(np.mean(signature_a == signature_b))
+
+
+class NearDuplicateIndex:
+    """
+    기사 MinHash 서명과 LSH 버킷을 저장하는 SQLite 인덱스입니다.
+    새 기사는 같은 버킷에 들어간 기사만 비교하므로 저장된 기사 수와 관계없이 빠르게 확인합니다.
+    중복 판단은 카테고리 안에서만 합니다.
+    """
+
+    def __init__(self, path=None, threshold=THRESHOLD):
+        self.path = path or os.path.join(CACHE_DIR, 'near_duplicates.sqlite3')
+        self.threshold = threshold
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = {}  # find_duplicates에서 계산한 서명 ((카테고리, 링크) -> 서명)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS params (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        # 링크 인덱스와 마찬가지로 여러 섹션에 실린 기사는 카테고리마다 따로 기록
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS article_signatures (id INTEGER PRIMARY KEY, link TEXT NOT NULL, "
+            "category TEXT NOT NULL, signature BLOB NOT NULL, UNIQUE (category, link))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (category TEXT NOT NULL, key INTEGER NOT NULL, id INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_buckets_key ON buckets (category, key)")
+        self._drop_legacy_signatures()
+        self._reset_if_params_changed()
+        self._conn.commit()
+
+    def _drop_legacy_signatures(self):
+        """링크만 UNIQUE였던 이전 signatures 테이블을 지웁니다. (ingest_category가 기존 기사로 다시 채움)"""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'signatures'"
+        ).fetchone()
+        if exists:
+            self._conn.execute("DROP TABLE signatures")
+            self._conn.execute("DELETE FROM buckets")
+
+    def _reset_if_params_changed(self):
+        """서명 길이/밴드/셰이글 설정이 바뀌면 저장된 서명과 비교할 수 없으므로 비웁니다."""
+        params = {'num_perm': NUM_PERM, 'bands': BANDS, 'shingle_size': SHINGLE_SIZE}
+        stored = dict(self._conn.execute("SELECT name, value FROM params"))
+        if stored and stored != params:
+            self._conn.execute("DELETE FROM article_signatures")
+            self._conn.execute("DELETE FROM buckets")
+        self._conn.executemany("INSERT OR REPLACE INTO params (name, value) VALUES (?, ?)", params.items())
+
+    def count(self, category):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM article_signatures WHERE category = ?", (category,)
+            ).fetchone()[0]
+
+    def _candidates(self, category, keys):
+        placeholders = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            f"SELECT link, signature FROM article_signatures WHERE id IN "
+            f"(SELECT id FROM buckets WHERE category = ? AND key IN ({placeholders}))",
+            [category, *keys]
+        )
+        return [(link, np.frombuffer(blob, dtype=np.uint32)) for link, blob in rows]
+
+    def find_duplicates(self, articles, category):
+        """
+        기사들을 순서대로 확인해 저장된 기사나 앞선 기사와 거의 같은 기사를 찾습니다.
+        :param articles: 'link', 'processed_body'가 있는 기사 딕셔너리 리스트
+        :return: (중복이 아닌 기사 리스트, {중복 기사 링크: 원본 기사 링크})
+        """
+        unique, duplicates = [], {}
+        batch_buckets = {}  # 이번 배치에서 채택한 기사의 버킷 -> [(링크, 서명)]
+        with metrics.span('near_duplicate_check', category=category), self._lock:
+            for article in articles:
+                signature = minhash_signature(article.get('processed_body'))
+                if signature is None:
+                    unique.append(article)
+                    continue
+                keys = band_keys(signature)
+                candidates = self._candidates(category, keys)
+                for key in keys:
+                    candidates.extend(batch_buckets.get(key, ()))
+
+                original = next((link for link, other in candidates
+                                 if estimated_similarity(signature, other) >= self.threshold), None)
+                if original is not None:
+                    duplicates[article['link']] = original
+                    continue
+                unique.append(article)
+                self._pending[(category, article['link'])] = signature  # add_many에서 다시 계산하지 않도록 보관
+                for key in keys:
+                    batch_buckets.setdefault(key, []).append((article['link'], signature))
+
+        if duplicates:
+            metrics.inc('near_duplicates', len(duplicates), category=category)
+        return unique, duplicates
+
+    def add_many(self, articles, category):
+        """기사 서명을 인덱스에 추가합니다. (find_duplicates에서 계산한 서명이 있으면 재사용)"""
+        with self._lock:
+            rows = []
+            for article in articles:
+                signature = self._pending.pop((category, article['link']), None)
+                if signature is None:
+                    signature = minhash_signature(article.get('processed_body'))
+                if signature is not None:
+                    rows.append((article['link'], signature))
+            for link, signature in rows:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO article_signatures (link, category, signature) VALUES (?, ?, ?)",
+                    (link, category, signature.tobytes())
+                )
+                if cursor.rowcount:
+                    self._conn.executemany(
+                        "INSERT INTO buckets (category, key, id) VALUES (?, ?, ?)",
+                        [(category, key, cursor.lastrowid) for key in band_keys(signature)]
+                    )
+            self._conn.commit()
@@ -0,0 +1,157 @@
+# 네이버 뉴스 증분 수집 파이프라인
+# 사용법 (project/ 디렉터리에서): python -m modules.news_ingest [카테고리 ...] --max-pages 5
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from modules import metrics
+from modules.crawler import NewsCrawler
+from modules.article_store import open_article_store
+from modules.near_duplicates import THRESHOLD as DEDUP_THRESHOLD, NearDuplicateIndex
+from modules.paths import CACHE_DIR, DATA_DIR
+from modules.search_index import build_search_index
+from modules.text_processing import TextProcessor
+from modules.tokenizer_service import get_tokenizer
+
+NEWS_AJAX_URL = 'https://news.naver.com/section/template/SECTION_ARTICLE_LIST'
+
+# 카테고리별 네이버 뉴스 섹션 ID
+CATEGORY_SIDS = {"정치": 100, "경제": 101, "사회": 102, "생활/문화": 103, "세계": 104, "IT/과학": 105}
+
+
+class LinkIndex:
+    """
+    이미 수집한 기사 링크를 카테고리별로 저장하는 SQLite 인덱스입니다.
+    새 링크만 본문을 가져오도록 하는 데 사용합니다.
+    여러 섹션에 실린 기사는 카테고리마다 따로 수집되도록 (링크, 카테고리) 단위로 기록합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, 'links.sqlite3')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS category_links "
+            "(link TEXT NOT NULL, category TEXT NOT NULL, fetched_at REAL NOT NULL, PRIMARY KEY (category, link))"
+        )
+        self._migrate_links_table()
+        self._conn.commit()
+
+    def _migrate_links_table(self):
+        """링크만 기본 키로 쓰던 이전 links 테이블이 있으면 옮기고 삭제합니다."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'links'"
+        ).fetchone()
+        if exists:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO category_links (link, category, fetched_at) "
+                "SELECT link, category, fetched_at FROM links"
+            )
+            self._conn.execute("DROP TABLE links")
+
+    def count(self, category):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM category_links WHERE category = ?", (category,)
+            ).fetchone()[0]
+
+    def contains_many(self, links, category, chunk_size=500):
+        """주어진 링크 중 해당 카테고리에서 이미 수집한 링크의 집합을 반환합니다."""
+        links = list(links)
+        found = set()
+        with self._lock:
+            for start in range(0, len(links), chunk_size):
+                chunk = links[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT link FROM category_links WHERE category = ? AND link IN ({placeholders})",
+                    [category, *chunk]
+                )
+                found.update(link for (link,) in rows)
+        return found
+
+    def add_many(self, links, category):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO category_links (link, category, fetched_at) VALUES (?, ?, ?)",
+                [(link, category, now) for link in links]
+            )
+            self._conn.commit()
+
+
+def ingest_category(category, crawler=None, link_index=None, processor=None, max_pages=5, data_dir=DATA_DIR,
+                    dedup_index=None):
+    """
+    카테고리 기사 목록을 가져와 처음 보는 링크만 본문 수집/전처리 후 기사 저장소에 추가합니다.
+    기존/같은 배치 기사와 거의 같은 기사(다른 언론사의 같은 통신사 기사 등)는 저장하지 않습니다.
+    :return: 새로 추가된 기사 리스트
+    """
+    crawler = crawler or NewsCrawler(NEWS_AJAX_URL)
+    link_index = link_index or LinkIndex()
+    dedup_index = dedup_index or NearDuplicateIndex()
+    store = open_article_store(category, data_dir)
+
+    # 인덱스가 비어 있으면 기존 기사 저장소의 링크/서명으로 초기화
+    if link_index.count(category) == 0:
+        link_index.add_many(store.iter_column('link'), category)
+    if dedup_index.count(category) == 0 and store.exists():
+        dedup_index.add_many(store.iter_records(('link', 'processed_body')), category)
+
+    listing = crawler.fetch_articles(CATEGORY_SIDS[category], max_pages=max_pages)
+    links = list(dict.fromkeys(item['link'] for item in listing if item['link'] != "No link"))
+    known_links = link_index.contains_many(links, category)
+    new_links = [link for link in links if link not in known_links]
+    print(f"{category}: 목록 {len(links)}건 중 새 기사 {len(new_links)}건")
+    if not new_links:
+        return []
+
+    processor = processor or TextProcessor(language='korean')
+    new_articles = []
+    for link, content in zip(new_links, crawler.fetch_article_contents(new_links)):
+        if content is None:
+            continue  # 실패한 기사는 인덱스에 넣지 않아 다음 실행에서 다시 시도
+        new_articles.append({
+            'title': content['title'],
+            'body': content['body'],
+            'link': link,
+        })
+    processed_bodies = processor.process_texts([article['body'] for article in new_articles])
+    for article, processed_body in zip(new_articles, processed_bodies):
+        article['processed_body'] = processed_body
+
+    new_articles, duplicates = dedup_index.find_duplicates(new_articles, category)
+    if new_articles:
+        total = store.append(new_articles)
+        dedup_index.add_many(new_articles, category)
+        print(f"{category}: {len(new_articles)}건 추가 (총 {total}건)")
+    if duplicates:
+        print(f"{category}: 거의 같은 기사 {len(duplicates)}건 제외")
+    # 중복으로 제외한 기사도 다시 가져오지 않도록 링크 인덱스에 기록
+    link_index.add_many([article['link'] for article in new_articles] + list(duplicates), category)
+    return new_articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 뉴스 증분 수집")
+    parser.add_argument('categories', nargs='*', default=list(CATEGORY_SIDS), help="수집할 카테고리 (기본값: 전체)")
+    parser.add_argument('--max-pages', type=int, default=5, help="카테고리별 최대 목록 페이지 수")
+    parser.add_argument('--dedup-threshold', type=float, default=DEDUP_THRESHOLD,
+                        help="이 값 이상 유사한(추정 자카드 유사도) 기사는 중복으로 제외")
+    args = parser.parse_args()
+
+    get_tokenizer(autostart=False)  # 일회성 작업이므로 형태소 분석 서비스를 새로 띄우지 않음 (떠 있으면 사용)
+    crawler = NewsCrawler(NEWS_AJAX_URL)
+    link_index = LinkIndex()
+    dedup_index = NearDuplicateIndex(threshold=args.dedup_threshold)
+    processor = TextProcessor(language='korean')
+    for category in args.categories:
+        ingest_category(category, crawler, link_index, processor, max_pages=args.max_pages, dedup_index=dedup_index)
+    build_search_index(list(CATEGORY_SIDS))  # 수집한 기사를 포함해 검색 색인을 다시 만듦
+    metrics.export_textfile(min_interval=0)  # 수집 작업의 HTTP/캐시 통계를 Prometheus 텍스트 파일로 기록
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+import os
+
+# 프로젝트 루트(project/)를 기준으로 한 경로 설정
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+MODEL_DIR = os.path.join(BASE_DIR, 'models')
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+
+
+def category_data_path(category, data_dir=DATA_DIR):
+    """카테고리 데이터 파일 경로 (슬래시를 언더스코어로 대체)"""
+    return os.path.join(data_dir, f"{category.replace('/', '_')}.json")
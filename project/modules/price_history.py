@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+from modules.paths import DATA_DIR
+
+
+class PriceHistory:
+    """
+    아파트 매물 조회 결과를 시점별로 쌓아 두는 시계열 저장소(SQLite)입니다.
+    추이 조회는 네트워크 없이 이 저장소만 사용합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, 'price_history.sqlite3')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                captured_at REAL NOT NULL,
+                dong TEXT NOT NULL,
+                complex TEXT NOT NULL,
+                area REAL,
+                trade_type TEXT NOT NULL,
+                price INTEGER,
+                floor TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_listings_dong_time ON listings (dong, captured_at);
+            CREATE INDEX IF NOT EXISTS idx_listings_trade_area_time ON listings (trade_type, area, captured_at);
+            CREATE INDEX IF NOT EXISTS idx_listings_complex_time ON listings (complex, captured_at);
+        """)
+        self._conn.commit()
+
+    def record_snapshot(self, dong, apartments, captured_at=None):
+        """
+        get_apartments 결과 한 번을 저장합니다.
+        :param dong: 법정동 이름
+        :param apartments: get_apartments가 반환한 매물 테이블 (가격/면적은 이미 숫자)
+        :param captured_at: 수집 시각(UNIX 시간, 기본값: 현재)
+        :return: 저장한 행 수
+        """
+        captured_at = captured_at or time.time()
+        area = apartments['area'].astype('float64').astype(object)
+        floor = apartments['floor_info'].astype(object)  # 층 정보가 없는 매물은 NULL로 저장
+        rows = list(zip(
+            [captured_at] * len(apartments),
+            [dong] * len(apartments),
+            apartments['name'].astype(str),
+            area.where(area.notna(), None).tolist(),
+            apartments['transaction_type'].astype(str),
+            apartments['price'].astype('int64').tolist(),
+            floor.where(floor.notna(), None).tolist(),
+        ))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO listings (captured_at, dong, complex, area, trade_type, price, floor) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def average_price_trend(self, area_min, area_max, weeks=8, dongs=None):
+        """
+        최근 N주 동안의 주별/동별 평균 매매가·전세가(억)를 조회합니다.
+        :return: '법정동', '주', '거래 유형', '평균 가격' 컬럼의 데이터프레임
+        """
+        since = time.time() - weeks * 7 * 86400
+        query = """
+            SELECT dong AS 법정동,
+                   date(captured_at, 'unixepoch', 'localtime', 'weekday 0', '-6 days') AS 주,
+                   trade_type AS "거래 유형",
+                   AVG(price) / 100000000.0 AS "평균 가격"
+            FROM listings
+            WHERE captured_at >= ? AND area >= ? AND area < ?
+              AND trade_type IN ('매매', '전세') AND price IS NOT NULL
+        """
+        params = [since, area_min, area_max]
+        if dongs:
+            query += f" AND dong IN ({','.join('?' * len(dongs))})"
+            params.extend(dongs)
+        query += " GROUP BY 법정동, 주, \"거래 유형\" ORDER BY 주"
+
+        with self._lock:
+            return pd.read_sql_query(query, self._conn, params=params)
+
+
+_default_history = None
+_default_history_lock = threading.Lock()
+
+
+def get_price_history():
+    """프로세스 전체에서 공유하는 기본 가격 이력 저장소를 반환합니다."""
+    global _default_history
+    with _default_history_lock:
+        if _default_history is None:
+            _default_history = PriceHistory()
+        return _default_history
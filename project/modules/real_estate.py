@@ -3,9 +3,20 @@ import json
 import streamlit as st
 import altair as alt
 import pandas as pd
-from modules.fetch_data import get_apartments
-from modules.utils import convert_price
-from modules.visualization import create_dataframe, create_bar_chart
+from modules import metrics
+from modules.data_processing import concat_listing_tables, empty_listing_table
+from modules.fetch_data import get_apartments_cached
+from modules.price_history import get_price_history
+from modules.visualization import create_dataframe, create_bar_chart, metrics_debug_enabled, render_metrics_panel
+from concurrent.futures import ThreadPoolExecutor
+
+# 동별 평균 탭에서 사용하는 면적대 (㎡, 하한 포함/상한 미포함)
+AREA_BANDS = [(50, 60), (80, 90)]
+
+# 매물 표에 한 번에 보내는 최대 행 수 (가격순 정렬 후 자름)
+MAX_TABLE_ROWS = 1000
+# 차트 보기: 표시 이름 -> create_bar_chart의 view
+CHART_VIEWS = {"단지별 가격 (상위)": "top", "가격 분포": "bins"}
 
 def render_real_estate_page():
     st.title("🏢 부동산 정보")
@@ -29,52 +40,62 @@ def render_real_estate_page():
     selected_dong = st.selectbox("법정동을 선택하세요:", list(dong_options.keys()))
 
     # 탭 생성
-    tab_50_60, tab_80_90, tab_average = st.tabs(["50~60㎡", "80~90㎡", "동별 평균 매매/전세"])
+    tab_50_60, tab_80_90, tab_average, tab_history = st.tabs(["50~60㎡", "80~90㎡", "동별 평균 매매/전세", "가격 추이"])
 
     # 50~60㎡ 탭 내용
     with tab_50_60:
         #st.subheader("50~60㎡ 아파트 데이터")
         data_type_50_60 = st.radio("거래 유형을 선택하세요:", ("매매", "전세"), horizontal=True, key="data_type_50_60")
+        chart_view_50_60 = st.radio("차트 보기:", list(CHART_VIEWS), horizontal=True, key="chart_view_50_60")
         if st.button("50~60㎡ 조회"):
-            process_real_estate_data(selected_dong, dong_options, data_type_50_60, 50, 60)
+            process_real_estate_data(selected_dong, dong_options, data_type_50_60, 50, 60,
+                                     chart_view=CHART_VIEWS[chart_view_50_60])
 
     # 80~90㎡ 탭 내용
     with tab_80_90:
         #st.subheader("80~90㎡ 아파트 데이터")
         data_type_80_90 = st.radio("거래 유형을 선택하세요:", ("매매", "전세"), horizontal=True, key="data_type_80_90")
+        chart_view_80_90 = st.radio("차트 보기:", list(CHART_VIEWS), horizontal=True, key="chart_view_80_90")
         if st.button("80~90㎡ 조회"):
-            process_real_estate_data(selected_dong, dong_options, data_type_80_90, 80, 90)
+            process_real_estate_data(selected_dong, dong_options, data_type_80_90, 80, 90,
+                                     chart_view=CHART_VIEWS[chart_view_80_90])
 
     # 동별 평균 매매/전세 탭 내용
     with tab_average:
         st.subheader("동별 평균 매매/전세 데이터")
 
-        # 50~60㎡ 동별 평균 매매/전세
-        with st.expander("50~60㎡ 동별 평균 매매/전세"):
-            calculate_and_display_average_prices(dong_options, 50, 60)
+        # 구 전체를 한 번만 크롤링하고 모든 면적대의 평균을 한 번에 계산
+        with metrics.span('district_fetch'):
+            district_df = get_district_apartments(dong_options)
+        with metrics.span('average_prices'):
+            average_prices = calculate_average_prices(district_df, list(dong_options.keys()))
+
+        for area_min, area_max in AREA_BANDS:
+            with st.expander(f"{area_min}~{area_max}㎡ 동별 평균 매매/전세"):
+                calculate_and_display_average_prices(average_prices, area_min, area_max)
+
+    # 가격 추이 탭 내용 (저장된 이력만 사용, 네트워크 요청 없음)
+    with tab_history:
+        display_price_history(list(dong_options.keys()), selected_dong)
 
-        # 80~90㎡ 동별 평균 매매/전세
-        with st.expander("80~90㎡ 동별 평균 매매/전세"):
-            calculate_and_display_average_prices(dong_options, 80, 90)
+    if metrics_debug_enabled():
+        render_metrics_panel()
 
-def process_real_estate_data(selected_dong, dong_options, data_type, area_min, area_max):
+def process_real_estate_data(selected_dong, dong_options, data_type, area_min, area_max, chart_view="top"):
     """
     특정 면적과 거래 유형에 따라 데이터를 필터링하고 시각화합니다.
+    :param chart_view: "top"(단지별 가격 상위) 또는 "bins"(가격 분포)
     """
     try:
-        apartments = get_apartments(selected_dong, dong_options)
+        apartments = get_apartments_cached(selected_dong, dong_options)
     except Exception as e:
         st.error(f"데이터를 가져오는 중 오류가 발생했습니다: {e}")
         return
 
-    if apartments:
-        # 데이터프레임 생성 및 필터링
+    if not apartments.empty:
+        # 데이터프레임 생성 및 필터링 (전용면적은 이미 숫자, 결측값은 비교에서 제외됨)
         try:
             filtered_df = create_dataframe(apartments, data_type)
-
-            # '전용면적' 컬럼 숫자 변환
-            filtered_df['전용면적'] = pd.to_numeric(filtered_df['전용면적'], errors='coerce')
-            filtered_df = filtered_df.dropna(subset=['전용면적'])  # 변환 실패한 값 제거
             filtered_df = filtered_df[(filtered_df['전용면적'] >= area_min) & (filtered_df['전용면적'] < area_max)]
         except KeyError as e:
             st.error(f"데이터 필터링 중 오류가 발생했습니다: {e}")
@@ -84,11 +105,14 @@ def process_real_estate_data(selected_dong, dong_options, data_type, area_min, a
             return
 
         if not filtered_df.empty:
-            st.dataframe(filtered_df)
-
-            # 차트 생성
-            chart = create_bar_chart(filtered_df, f"{area_min}~{area_max}㎡ - {data_type} 아파트 가격")
-            if chart:
+            if len(filtered_df) > MAX_TABLE_ROWS:
+                st.caption(f"전체 {len(filtered_df)}건 중 가격이 높은 {MAX_TABLE_ROWS}건만 표시합니다.")
+            st.dataframe(filtered_df.nlargest(MAX_TABLE_ROWS, '가격'))
+
+            # 차트 생성 (서버에서 집계한 데이터만 브라우저로 전송)
+            chart = create_bar_chart(filtered_df, f"{area_min}~{area_max}㎡ - {data_type} 아파트 가격",
+                                     view=chart_view)
+            if chart is not None:
                 st.altair_chart(chart, use_container_width=True)
             else:
                 st.warning("차트를 생성할 수 있는 데이터가 없습니다.")
@@ -97,32 +121,54 @@ def process_real_estate_data(selected_dong, dong_options, data_type, area_min, a
     else:
         st.error("아파트 데이터를 가져오지 못했습니다.")
 
-def calculate_and_display_average_prices(dong_options, area_min, area_max):
+def get_district_apartments(dong_options, max_workers=4):
+    """
+    모든 동의 아파트 데이터를 동시에 가져와 하나의 매물 테이블로 합칩니다.
+    :return: 모든 동의 매물 테이블 (dong 컬럼으로 구분)
+    """
+    def fetch(dong):
+        try:
+            return get_apartments_cached(dong, dong_options)
+        except Exception as e:
+            print(f"{dong} 데이터를 가져오는 중 오류 발생: {e}")
+            return empty_listing_table()
+
+    dongs = list(dong_options.keys())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(fetch, dongs))
+
+    return concat_listing_tables(results)
+
+
+def calculate_average_prices(district_df, dongs, area_bands=AREA_BANDS):
+    """
+    면적대/동/거래 유형별 평균 가격(억)을 한 번의 groupby로 계산합니다.
+    :param district_df: get_district_apartments 결과
+    :param dongs: 결과에 포함할 법정동 목록 (데이터가 없는 동은 0)
+    :return: (면적대, 법정동) 인덱스와 '평균 매매가', '평균 전세가' 컬럼을 가진 데이터프레임
+    """
+    bands = pd.IntervalIndex.from_tuples(area_bands, closed='left')
+    df = district_df[district_df['transaction_type'].isin(['매매', '전세'])]
+    df = df[['dong', 'transaction_type', 'price']].assign(band=pd.cut(df['area'], bands)).dropna(subset=['band'])
+
+    means = (
+        df.groupby(['band', 'dong', 'transaction_type'], observed=True)['price'].mean()
+        .unstack('transaction_type')
+        .reindex(columns=['매매', '전세'])
+    )
+    full_index = pd.MultiIndex.from_product([bands, dongs], names=['band', '법정동'])
+    means = means.reindex(full_index).fillna(0) / 100000000
+    return means.rename(columns={'매매': '평균 매매가', '전세': '평균 전세가'}).rename_axis(columns=None)
+
+
+def calculate_and_display_average_prices(average_prices, area_min, area_max):
     """
-    주어진 면적 범위에 대한 동별 평균 매매가 및 전세가를 계산하고 표시합니다.
+    주어진 면적 범위에 대한 동별 평균 매매가 및 전세가를 표시합니다.
+    :param average_prices: calculate_average_prices 결과
     """
-    average_prices = []
-    average_rent_prices = []
-    for dong in dong_options.keys():
-        apartments = get_apartments(dong, dong_options)
-        sale_prices = []
-        rent_prices = []
-        for apt in apartments:
-            area_value = float(apt['area']) if apt['area'] else 0
-            price_value = convert_price(apt['price']) if apt['price'] else None
-            if area_min <= area_value < area_max:
-                if apt['transaction_type'] == '매매' and price_value is not None:
-                    sale_prices.append(price_value)
-                elif apt['transaction_type'] == '전세' and price_value is not None:
-                    rent_prices.append(price_value)
-        average_sale_price = sum(sale_prices) / len(sale_prices) if sale_prices else 0
-        average_rent_price = sum(rent_prices) / len(rent_prices) if rent_prices else 0
-        average_prices.append({'법정동': dong, '평균 매매가': average_sale_price / 100000000})
-        average_rent_prices.append({'법정동': dong, '평균 전세가': average_rent_price / 100000000})
-
-    df_avg_prices = pd.DataFrame(average_prices)
-    df_avg_rent_prices = pd.DataFrame(average_rent_prices)
-    df_combined = pd.merge(df_avg_prices, df_avg_rent_prices, on='법정동')
+    band_prices = average_prices.xs(pd.Interval(area_min, area_max, closed='left'), level='band').reset_index()
+    df_avg_prices = band_prices[['법정동', '평균 매매가']].copy()
+    df_avg_rent_prices = band_prices[['법정동', '평균 전세가']].copy()
 
     st.write(f"{area_min}~{area_max}㎡ 동별 평균 매매가 및 전세가")
 
@@ -145,3 +191,35 @@ def calculate_and_display_average_prices(dong_options, area_min, area_max):
 
     # 그래프 출력
     st.altair_chart(chart, use_container_width=True)
+
+
+def display_price_history(dongs, selected_dong):
+    """
+    가격 이력 저장소에서 최근 N주 동별 평균 매매가/전세가 추이를 조회해 표시합니다.
+    """
+    st.subheader("동별 평균 가격 추이")
+
+    area_labels = [f"{area_min}~{area_max}㎡" for area_min, area_max in AREA_BANDS]
+    area_label = st.radio("면적을 선택하세요:", area_labels, horizontal=True, key="history_area")
+    area_min, area_max = AREA_BANDS[area_labels.index(area_label)]
+    data_type = st.radio("거래 유형을 선택하세요:", ("매매", "전세"), horizontal=True, key="history_data_type")
+    weeks = st.slider("조회 기간 (주)", min_value=1, max_value=52, value=8, key="history_weeks")
+    selected_dongs = st.multiselect("법정동을 선택하세요:", dongs, default=[selected_dong], key="history_dongs")
+
+    trend = get_price_history().average_price_trend(area_min, area_max, weeks=weeks, dongs=selected_dongs)
+    trend = trend[trend['거래 유형'] == data_type]
+    if trend.empty:
+        st.info("저장된 가격 이력이 없습니다. 다른 탭에서 데이터를 조회하면 이력이 쌓입니다.")
+        return
+
+    chart = alt.Chart(trend).mark_line(point=True).encode(
+        x=alt.X('주:T', title='주'),
+        y=alt.Y('평균 가격:Q', title='가격(억)'),
+        color=alt.Color('법정동:N', title='법정동', legend=alt.Legend(orient='top')),
+        tooltip=[alt.Tooltip('법정동:N', title='법정동'), alt.Tooltip('주:T', title='주'),
+                 alt.Tooltip('평균 가격:Q', title='가격(억)', format=',.2f')]
+    ).properties(
+        width=700,
+        height=400
+    )
+    st.altair_chart(chart, use_container_width=True)
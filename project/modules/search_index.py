@@ -0,0 +1,260 @@
+# 뉴스 키워드 검색: 모든 카테고리 processed_body(Okt 토큰)에 대한 BM25 역색인
+# 사용법 (project/ 디렉터리에서): python -m modules.search_index build
+#                                python -m modules.search_index query "반도체 수출"
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+import numpy as np
+from modules import metrics
+from modules.article_store import open_article_store
+from modules.paths import DATA_DIR
+
+SEARCH_INDEX_PATH = os.path.join(DATA_DIR, 'search_index', 'bm25.npz')
+INDEX_VERSION = 1
+
+
+class SearchIndex:
+    """
+    BM25 점수를 계산하는 역색인입니다. 게시 목록(posting)은 CSR 형태의 NumPy 배열로 저장합니다.
+    - terms[i]의 게시 목록: doc_ids[indptr[i]:indptr[i+1]], tfs[같은 범위]
+    - 문서 번호 d는 (doc_category[d], doc_row[d]) = (카테고리 번호, 기사 저장소 행 번호)
+    검색 시 말뭉치를 다시 읽지 않고, 결과 문서의 title/link만 기사 저장소에서 오프셋으로 읽습니다.
+    """
+
+    def __init__(self, terms, indptr, doc_ids, tfs, doc_lengths, doc_category, doc_row, categories, versions,
+                 k1=1.5, b=0.75):
+        self.terms = terms
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.doc_category = doc_category
+        self.doc_row = doc_row
+        self.categories = categories
+        self.versions = versions
+        self.k1 = k1
+        self.b = b
+        self.avg_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+        # BM25 길이 정규화 항은 문서마다 고정이므로 미리 계산
+        self._length_norm = (k1 * (1 - b + b * doc_lengths / self.avg_length)).astype(np.float32) \
+            if self.avg_length else np.zeros(0, dtype=np.float32)
+        self._stores = {}
+
+    @property
+    def num_docs(self):
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, categories, data_dir=DATA_DIR, k1=1.5, b=0.75):
+        """
+        카테고리 기사 저장소의 processed_body로 색인을 만듭니다.
+        :param categories: 색인할 카테고리 목록 (순서가 카테고리 번호)
+        """
+        term_ids = {}
+        postings_term, postings_doc, postings_tf = [], [], []
+        doc_lengths, doc_category, doc_row = [], [], []
+        versions = {}
+
+        for category_id, category in enumerate(categories):
+            store = open_article_store(category, data_dir)
+            if not store.exists():
+                continue
+            versions[category] = store.count
+            for row, body in enumerate(store.iter_column('processed_body')):
+                tokens = [word for word in (body or '').split() if len(word) > 1]
+                doc_id = len(doc_lengths)
+                doc_lengths.append(len(tokens))
+                doc_category.append(category_id)
+                doc_row.append(row)
+                for term, tf in Counter(tokens).items():
+                    postings_term.append(term_ids.setdefault(term, len(term_ids)))
+                    postings_doc.append(doc_id)
+                    postings_tf.append(tf)
+
+        postings_term = np.asarray(postings_term, dtype=np.int64)
+        order = np.argsort(postings_term, kind='stable')  # 용어 순으로 정렬 (같은 용어 안에서는 문서 순서 유지)
+        indptr = np.zeros(len(term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(postings_term, minlength=len(term_ids)), out=indptr[1:])
+
+        terms = [None] * len(term_ids)
+        for term, term_id in term_ids.items():
+            terms[term_id] = term
+        return cls(
+            terms=terms,
+            indptr=indptr,
+            doc_ids=np.asarray(postings_doc, dtype=np.int32)[order],
+            tfs=np.minimum(np.asarray(postings_tf, dtype=np.int64), np.iinfo(np.uint16).max).astype(np.uint16)[order],
+            doc_lengths=np.asarray(doc_lengths, dtype=np.float32),
+            doc_category=np.asarray(doc_category, dtype=np.uint8),
+            doc_row=np.asarray(doc_row, dtype=np.int32),
+            categories=list(categories),
+            versions=versions,
+            k1=k1,
+            b=b,
+        )
+
+    def save(self, path=SEARCH_INDEX_PATH):
+        """색인을 npz 파일 하나로 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {'version': INDEX_VERSION, 'categories': self.categories, 'versions': self.versions,
+                'k1': self.k1, 'b': self.b, 'built_at': time.time()}
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.npz', dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(
+                f, terms=np.asarray(self.terms, dtype=str), indptr=self.indptr, doc_ids=self.doc_ids, tfs=self.tfs,
+                doc_lengths=self.doc_lengths, doc_category=self.doc_category, doc_row=self.doc_row,
+                meta=np.asarray(json.dumps(meta, ensure_ascii=False))
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=SEARCH_INDEX_PATH):
+        """저장된 색인을 불러옵니다. 없거나 형식 버전이 다르면 None."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != INDEX_VERSION:
+                return None
+            return cls(
+                terms=data['terms'].tolist(), indptr=data['indptr'], doc_ids=data['doc_ids'], tfs=data['tfs'],
+                doc_lengths=data['doc_lengths'], doc_category=data['doc_category'], doc_row=data['doc_row'],
+                categories=meta['categories'], versions=meta['versions'], k1=meta['k1'], b=meta['b'],
+            )
+
+    def is_stale(self, data_dir=DATA_DIR):
+        """색인 이후 기사 저장소의 기사 수가 바뀌었는지 확인합니다."""
+        for category in self.categories:
+            store = open_article_store(category, data_dir)
+            if (store.count if store.exists() else None) != self.versions.get(category):
+                return True
+        return False
+
+    def score(self, query_terms, categories=None):
+        """
+        질의 용어들의 BM25 점수를 문서별로 계산합니다.
+        :param query_terms: 질의 토큰 리스트 (processed_body와 같은 방식으로 분석된 토큰)
+        :param categories: 결과를 제한할 카테고리 목록 (None이면 전체)
+        :return: 문서별 점수 배열 (float32)
+        """
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        for term in set(query_terms):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            doc_ids = self.doc_ids[start:end]
+            tfs = self.tfs[start:end].astype(np.float32)
+            idf = np.log1p((self.num_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + self._length_norm[doc_ids])
+
+        if categories is not None:
+            allowed = [i for i, category in enumerate(self.categories) if category in categories]
+            scores[~np.isin(self.doc_category, allowed)] = 0
+        return scores
+
+    def search(self, query_terms, topn=20, categories=None, data_dir=DATA_DIR):
+        """
+        :return: 점수순 [{'category', 'title', 'link', 'score'}] (점수가 0인 문서는 제외)
+        """
+        scores = self.score(query_terms, categories)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > topn:
+            candidates = candidates[np.argpartition(scores[candidates], -topn)[-topn:]]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        hits = []
+        for doc_id in ranked:
+            category = self.categories[self.doc_category[doc_id]]
+            hits.append({'category': category, 'row': int(self.doc_row[doc_id]), 'score': float(scores[doc_id])})
+
+        # 카테고리별로 묶어 기사 저장소에서 title/link만 읽음
+        by_category = {}
+        for hit in hits:
+            by_category.setdefault(hit['category'], []).append(hit)
+        for category, category_hits in by_category.items():
+            if category not in self._stores:
+                self._stores[category] = open_article_store(category, data_dir)
+            store = self._stores[category]
+            records = store.get_rows([hit['row'] for hit in category_hits], ('title', 'link'))
+            for hit, record in zip(category_hits, records):
+                hit.update(record)
+        return hits
+
+
+def tokenize_query(query):
+    """질의를 processed_body와 같은 방식(정제 → 형태소 분석 → 불용어 제거)으로 토큰화합니다."""
+    from modules.text_processing import get_processor
+    return [word for word in get_processor().process_text(query).split() if len(word) > 1]
+
+
+def build_search_index(categories, path=SEARCH_INDEX_PATH, data_dir=DATA_DIR):
+    """색인을 새로 만들어 저장합니다."""
+    with metrics.span('search_index_build'):
+        index = SearchIndex.build(categories, data_dir)
+        index.save(path)
+    print(f"검색 색인 저장: 문서 {index.num_docs}건, 용어 {len(index.terms)}개 ({path})")
+    return index
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_search_index(categories, path=SEARCH_INDEX_PATH):
+    """
+    공유 검색 색인을 반환합니다. 저장된 색인이 없거나 기사 저장소보다 오래되었으면 다시 만듭니다.
+    """
+    global _default_index
+    with _default_index_lock:
+        index = _default_index
+        # 카테고리 순서는 색인 내부 번호일 뿐이므로 집합으로 비교
+        if index is None or set(index.categories) != set(categories):
+            index = SearchIndex.load(path)
+        if index is None or set(index.categories) != set(categories) or index.is_stale():
+            index = build_search_index(categories, path)
+        _default_index = index
+        return index
+
+
+def search_articles(query, categories, topn=20, path=SEARCH_INDEX_PATH):
+    """질의어로 기사를 검색합니다. :return: 점수순 [{'category', 'title', 'link', 'score'}]"""
+    index = get_search_index(categories, path)
+    with metrics.span('search_query'):
+        return index.search(tokenize_query(query), topn=topn)
+
+
+def main():
+    from modules.news_ingest import CATEGORY_SIDS
+    from modules.tokenizer_service import get_tokenizer
+
+    parser = argparse.ArgumentParser(description="뉴스 검색 색인")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('build', help="색인을 새로 만듭니다")
+    query_parser = subparsers.add_parser('query', help="색인으로 기사를 검색합니다")
+    query_parser.add_argument('query')
+    query_parser.add_argument('--topn', type=int, default=10)
+    args = parser.parse_args()
+
+    get_tokenizer(autostart=False)  # 일회성 작업이므로 형태소 분석 서비스를 새로 띄우지 않음 (떠 있으면 사용)
+    categories = list(CATEGORY_SIDS)
+    if args.command == 'build':
+        build_search_index(categories)
+        return
+
+    start = time.perf_counter()
+    hits = search_articles(args.query, categories, topn=args.topn)
+    elapsed = (time.perf_counter() - start) * 1000
+    for rank, hit in enumerate(hits, 1):
+        print(f"{rank:2d}. [{hit['category']}] {hit['title']} ({hit['score']:.2f})\n    {hit['link']}")
+    print(f"{len(hits)}건 ({elapsed:.1f}ms)")
+
+
+if __name__ == '__main__':
+    main()
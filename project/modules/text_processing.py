@@ -1,13 +1,12 @@
-from konlpy.tag import Okt
 import re
 import os
 import json
-from gensim import corpora
-from gensim.models import LdaModel
+import threading
+from modules.tokenizer_service import get_tokenizer
 
 class TextProcessor:
     def __init__(self, language='korean'):
-        self.okt = Okt()
+        self.okt = get_tokenizer()  # 공유 형태소 분석 서비스 (morphs 호출 시 연결)
         if language == 'korean':
             self.stop_words = set([
             '그리고', '그', '이', '저', '것', '등', '수', '들', '에서', '이다',
@@ -43,6 +42,12 @@ class TextProcessor:
         cleaned_text = self.clean_text(text)
         return self.remove_stopwords(cleaned_text)
 
+    def process_texts(self, texts):
+        """여러 문서를 한 번에 정제 및 불용어 제거 (형태소 분석 요청을 묶어서 보냄)"""
+        cleaned_texts = [self.clean_text(text) for text in texts]
+        return [' '.join(word for word in words if word not in self.stop_words)
+                for words in self.okt.morphs_batch(cleaned_texts)]
+
 def load_data(data_dir):
     """
     지정된 디렉터리에서 모든 JSON 파일을 읽어 텍스트 데이터를 로드합니다.
@@ -61,20 +66,18 @@ def load_data(data_dir):
                         all_texts.append(body)
     return all_texts
 
-def preprocess_data(texts):
-    """텍스트 데이터 전처리 및 토큰화"""
-    okt = Okt()
-    tokenized_texts = []
-
-    for text in texts:
-        # 텍스트 정제 (특수문자 제거)
-        text = re.sub(r'[^가-힣\s]', '', text)
-        # 형태소 분석 및 불용어 제거
-        tokens = [word for word in okt.morphs(text) if len(word) > 1]  # 길이가 1 이하인 단어 제거
-        tokenized_texts.append(tokens)
-
-    return tokenized_texts
+def preprocess_data(texts, cache=None, workers=None):
+    """토큰 캐시를 사용하는 공용 구현(modules.topic_modeling.preprocess_data)을 호출합니다."""
+    from modules.topic_modeling import preprocess_data as _preprocess_data
+    return _preprocess_data(texts, cache=cache, workers=workers)
 
+_default_processor = None
+_default_processor_lock = threading.Lock()
 
-# TextProcessor 초기화
-processor = TextProcessor(language='korean')
+def get_processor():
+    """공유 TextProcessor(한국어)를 처음 호출할 때 생성해 반환합니다."""
+    global _default_processor
+    with _default_processor_lock:
+        if _default_processor is None:
+            _default_processor = TextProcessor(language='korean')
+        return _default_processor
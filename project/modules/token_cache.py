@@ -0,0 +1,89 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from modules import metrics
+from modules.paths import CACHE_DIR
+
+# 토크나이저나 정제 규칙이 바뀌면 버전을 올려 기존 캐시를 무효화합니다.
+TOKENIZER_VERSION = "okt-morphs-v1"
+
+
+class TokenCache:
+    """
+    문서 텍스트 해시를 키로 형태소 분석 결과를 저장하는 SQLite 캐시입니다.
+    이미 분석한 문서는 다시 Okt를 호출하지 않도록 합니다.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, 'tokens.sqlite3')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (key BLOB PRIMARY KEY, tokens TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(text):
+        """정제된 텍스트의 내용 해시 (16바이트)"""
+        return hashlib.blake2b(f"{TOKENIZER_VERSION}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def get_many(self, keys, chunk_size=500):
+        """
+        키 목록에 해당하는 토큰을 조회합니다.
+        :return: {key: 토큰 리스트} (캐시에 있는 키만 포함)
+        """
+        keys = list(dict.fromkeys(keys))  # 중복 제거 (순서 유지)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, tokens FROM tokens WHERE key IN ({placeholders})", chunk
+                )
+                for key, tokens in rows:
+                    found[key] = tokens.split(' ') if tokens else []
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        metrics.inc('cache_hits', len(found), cache='tokens')
+        metrics.inc('cache_misses', len(keys) - len(found), cache='tokens')
+        return found
+
+    def put_many(self, items):
+        """
+        {key: 토큰 리스트}를 저장합니다. 토큰에는 공백이 없으므로 공백으로 이어 저장합니다.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tokens (key, tokens) VALUES (?, ?)",
+                [(key, ' '.join(tokens)) for key, tokens in items.items()]
+            )
+            self._conn.commit()
+
+    def stats(self):
+        """누적 적중/미스 건수"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    """프로세스 전체에서 공유하는 기본 토큰 캐시를 반환합니다."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TokenCache()
+        return _default_cache
@@ -0,0 +1,97 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# 워커 프로세스마다 하나씩 유지되는 Okt 인스턴스
+_worker_okt = None
+
+
+def _init_worker():
+    """워커 프로세스 초기화: Okt(JVM)를 한 번만 띄우고 미리 워밍업합니다."""
+    global _worker_okt
+    from konlpy.tag import Okt
+    _worker_okt = Okt()
+    _worker_okt.morphs("형태소 분석기 준비")
+
+
+def _morphs_chunk(texts):
+    """워커에서 문서 묶음을 형태소 분석합니다."""
+    return [_worker_okt.morphs(text) for text in texts]
+
+
+def default_workers(workers=None):
+    """워커 수 (기본값: CPU 코어 수 - 1)"""
+    return workers or max(1, (os.cpu_count() or 2) - 1)
+
+
+class TokenizerPool:
+    """
+    문서 묶음을 여러 프로세스에 나누어 형태소 분석합니다.
+    각 워커는 자체 Okt/JVM을 유지하므로 풀을 재사용하면 워밍업 비용이 한 번만 듭니다.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = default_workers(workers)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # JVM이 떠 있는 부모 프로세스를 fork하면 안전하지 않으므로 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def morphs_batch(self, texts, chunksize=None):
+        """
+        문서 리스트를 형태소 분석합니다. 결과는 입력 순서를 유지합니다.
+        :param texts: 정제된 문서 텍스트 리스트
+        :param chunksize: 한 번에 워커로 보낼 문서 수 (기본값: 워커당 약 4개 묶음)
+        :return: 문서별 형태소 리스트
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+
+        chunksize = chunksize or max(1, math.ceil(len(texts) / (self.workers * 4)))
+        chunks = [texts[start:start + chunksize] for start in range(0, len(texts), chunksize)]
+
+        results = []
+        for chunk_result in self._get_executor().map(_morphs_chunk, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+_default_pools = {}  # 워커 수 -> 공유 풀
+_default_pools_lock = threading.Lock()
+
+
+def get_tokenizer_pool(workers=None):
+    """
+    프로세스 전체에서 공유하는 토크나이저 풀을 워커 수별로 반환합니다.
+    (워커마다 JVM을 띄우므로 호출하는 쪽은 같은 워커 수를 쓰는 것이 좋습니다)
+    """
+    workers = default_workers(workers)
+    with _default_pools_lock:
+        if workers not in _default_pools:
+            _default_pools[workers] = TokenizerPool(workers)
+        return _default_pools[workers]
+
+
+def tokenize_batch(texts, workers=None, chunksize=None):
+    """
+    문서 리스트를 프로세스 풀에서 형태소 분석합니다. (입력 순서 유지)
+    """
+    return get_tokenizer_pool(workers).morphs_batch(texts, chunksize=chunksize)
@@ -0,0 +1,394 @@
+# 공유 형태소 분석 서비스: Okt(JVM)를 한 번만 띄워 두고 여러 세션/프로세스가 IPC로 재사용합니다.
+# 사용법 (project/ 디렉터리에서): python -m modules.tokenizer_service [--port 6011] [--stats]
+# 서비스가 떠 있지 않으면 클라이언트가 백그라운드로 실행하고, 준비될 때까지는 프로세스 내 Okt로 분석합니다.
+# 백그라운드 서비스는 연결이 모두 끊기고 IDLE_TIMEOUT초 동안 요청이 없으면 스스로 종료하며,
+# 바로 종료하려면 python -m modules.tokenizer_service --stop 을 실행합니다.
+# 일회성 스크립트(수집, 벤치마크 등)는 get_tokenizer(autostart=False)로 서비스를 새로 띄우지 않습니다.
+# 서비스 출력(기동 실패 원인 등)은 cache/tokenizer_service.log에 기록됩니다.
+import argparse
+import collections
+import os
+import queue
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from modules.paths import BASE_DIR, CACHE_DIR
+
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = int(os.environ.get('TOKENIZER_SERVICE_PORT', 6011))
+# 'off'로 설정하면 서비스를 사용하지 않고 항상 프로세스 내 Okt로 분석
+SERVICE_ENABLED = os.environ.get('TOKENIZER_SERVICE', 'on') != 'off'
+# 인증 키는 같은 사용자만 읽을 수 있는 파일에 보관 (서버와 클라이언트가 공유)
+AUTHKEY_PATH = os.path.join(CACHE_DIR, 'tokenizer_service.key')
+SERVICE_LOG_PATH = os.path.join(CACHE_DIR, 'tokenizer_service.log')
+
+MAX_QUEUE = 32        # 대기 중인 요청 수 상한 (넘으면 거절 → 클라이언트가 직접 분석)
+MAX_BATCH = 256       # 요청 한 번에 보낼 수 있는 문서 수 (클라이언트가 나눠서 전송)
+LATENCY_WINDOW = 1000  # 지연 시간 통계에 사용하는 최근 요청 수
+REQUEST_TIMEOUT = 60.0  # 응답을 기다리는 최대 시간(초). 넘으면 연결을 끊고 직접 분석
+MAX_SPAWN_FAILURES = 3  # 서비스 프로세스가 연속으로 이만큼 비정상 종료하면 더 이상 실행하지 않음
+# 연결이 없고 요청이 없는 상태가 이 시간(초) 이어지면 서비스 종료 (0이면 종료하지 않음)
+IDLE_TIMEOUT = float(os.environ.get('TOKENIZER_SERVICE_IDLE_TIMEOUT', 600))
+
+
+def load_authkey(path=AUTHKEY_PATH):
+    """인증 키를 읽고, 없으면 새로 만들어 저장합니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, 'rb') as f:
+            return f.read()
+    key = secrets.token_hex(32).encode('ascii')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+class TokenizerServer:
+    """
+    Okt 하나를 유지하는 형태소 분석 서버입니다.
+    연결마다 스레드가 요청을 받아 제한된 크기의 큐에 넣고, 분석 스레드 하나가 순서대로 처리합니다.
+    요청 형식: ('morphs', [텍스트, ...]), ('stats', None) 또는 ('shutdown', None)
+    응답 형식: ('ok', 결과), ('busy', None), ('error', 메시지)
+    열린 연결이 없고 idle_timeout초 동안 요청이 없으면 스스로 종료합니다.
+    """
+
+    def __init__(self, host=SERVICE_HOST, port=SERVICE_PORT, authkey=None, max_queue=MAX_QUEUE, max_batch=MAX_BATCH,
+                 idle_timeout=IDLE_TIMEOUT):
+        self.address = (host, port)
+        self.authkey = authkey or load_authkey()
+        self.max_batch = max_batch
+        self.idle_timeout = idle_timeout
+        self._jobs = queue.Queue(maxsize=max_queue)
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._stats_lock = threading.Lock()
+        self._counters = {'requests': 0, 'documents': 0, 'rejected': 0, 'errors': 0}
+        self._started_at = time.time()
+        self._okt = None
+        self._stopping = threading.Event()
+        self._connections = 0
+        self._last_active = time.monotonic()
+
+    def serve_forever(self):
+        from konlpy.tag import Okt
+        self._okt = Okt()
+        self._okt.morphs("형태소 분석기 준비")  # JVM 워밍업
+        threading.Thread(target=self._work, name="tokenizer-worker", daemon=True).start()
+        if self.idle_timeout > 0:
+            threading.Thread(target=self._watch_idle, name="tokenizer-idle", daemon=True).start()
+
+        with Listener(self.address, backlog=64, authkey=self.authkey) as listener:
+            print(f"형태소 분석 서비스 시작: {self.address[0]}:{self.address[1]}", flush=True)
+            while not self._stopping.is_set():
+                try:
+                    conn = listener.accept()
+                except Exception as e:  # 인증 실패 등은 해당 연결만 무시
+                    if self._stopping.is_set():
+                        break
+                    print(f"연결 수락 중 오류 발생: {e}", flush=True)
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        print("형태소 분석 서비스 종료", flush=True)
+
+    def shutdown(self):
+        """새 연결 수락을 멈추고 serve_forever를 끝냅니다."""
+        self._stopping.set()
+        # 대기 중인 accept()는 소켓을 닫아도 깨어나지 않을 수 있으므로 빈 연결로 깨움
+        try:
+            socket.create_connection(self.address, timeout=1).close()
+        except OSError:
+            pass
+
+    def _watch_idle(self):
+        """열린 연결과 대기 중인 요청이 없는 상태가 idle_timeout초 이어지면 서비스를 종료합니다."""
+        while not self._stopping.wait(min(self.idle_timeout, 30.0)):
+            with self._stats_lock:
+                idle = self._connections == 0 and time.monotonic() - self._last_active >= self.idle_timeout
+            if idle and self._jobs.empty():
+                print(f"{self.idle_timeout:g}초 동안 요청이 없어 종료합니다.", flush=True)
+                self.shutdown()
+
+    def _work(self):
+        """큐에서 요청을 꺼내 순서대로 분석합니다."""
+        while True:
+            texts, enqueued_at, done = self._jobs.get()
+            started_at = time.perf_counter()
+            try:
+                done['result'] = ('ok', [self._okt.morphs(text) for text in texts])
+            except Exception as e:
+                done['result'] = ('error', str(e))
+            finished_at = time.perf_counter()
+            with self._stats_lock:
+                self._latencies.append((started_at - enqueued_at, finished_at - enqueued_at))
+            done['event'].set()
+
+    def _handle(self, conn):
+        """한 클라이언트 연결의 요청을 처리합니다."""
+        with self._stats_lock:
+            self._connections += 1
+        try:
+            with conn:
+                self._serve_connection(conn)
+        finally:
+            with self._stats_lock:
+                self._connections -= 1
+                self._last_active = time.monotonic()
+
+    def _serve_connection(self, conn):
+        while True:
+            try:
+                op, payload = conn.recv()
+            except (EOFError, OSError):
+                return
+            with self._stats_lock:
+                self._last_active = time.monotonic()
+            if op == 'stats':
+                conn.send(('ok', self.stats()))
+            elif op == 'shutdown':
+                conn.send(('ok', None))
+                self.shutdown()
+                return
+            elif op == 'morphs':
+                conn.send(self._submit(payload))
+            else:
+                conn.send(('error', f"알 수 없는 요청: {op}"))
+
+    def _submit(self, texts):
+        if len(texts) > self.max_batch:
+            return ('error', f"요청당 최대 {self.max_batch}건까지 분석할 수 있습니다.")
+        done = {'event': threading.Event()}
+        try:
+            self._jobs.put_nowait((texts, time.perf_counter(), done))
+        except queue.Full:
+            with self._stats_lock:
+                self._counters['rejected'] += 1
+            return ('busy', None)
+        done['event'].wait()
+        with self._stats_lock:
+            self._counters['requests'] += 1
+            self._counters['documents'] += len(texts)
+            if done['result'][0] != 'ok':
+                self._counters['errors'] += 1
+        return done['result']
+
+    def stats(self):
+        """큐 깊이, 처리량, 지연 시간(대기/전체, ms) 통계"""
+        with self._stats_lock:
+            latencies = list(self._latencies)
+            stats = dict(self._counters)
+        stats.update({
+            'queue_depth': self._jobs.qsize(),
+            'queue_capacity': self._jobs.maxsize,
+            'connections': self._connections,
+            'uptime_seconds': round(time.time() - self._started_at, 1),
+        })
+        for name, values in (('wait', [w for w, _ in latencies]), ('latency', [t for _, t in latencies])):
+            values.sort()
+            if values:
+                stats[f'{name}_ms_avg'] = round(sum(values) / len(values) * 1000, 2)
+                stats[f'{name}_ms_p50'] = round(values[len(values) // 2] * 1000, 2)
+                stats[f'{name}_ms_p95'] = round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 2)
+        return stats
+
+
+class TokenizerClient:
+    """
+    형태소 분석 서비스 클라이언트입니다.
+    서비스에 연결할 수 없거나 서비스가 바쁘면 프로세스 내 Okt로 직접 분석합니다.
+    """
+
+    def __init__(self, host=SERVICE_HOST, port=SERVICE_PORT, authkey=None, autostart=True,
+                 enabled=SERVICE_ENABLED, max_batch=MAX_BATCH, retry_interval=30.0, timeout=REQUEST_TIMEOUT):
+        """
+        :param autostart: 서비스가 없으면 백그라운드 프로세스로 실행
+        :param enabled: False이면 항상 프로세스 내 Okt 사용
+        :param retry_interval: 연결 실패 후 다시 연결을 시도하기까지의 시간(초)
+        :param timeout: 응답을 기다리는 최대 시간(초)
+        """
+        self.address = (host, port)
+        self.authkey = authkey
+        self.autostart = autostart
+        self.enabled = enabled
+        self.max_batch = max_batch
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+        self._local = threading.local()  # 스레드별 연결 (Connection은 스레드 간 공유 불가)
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0
+        self._spawned = None
+        self._spawn_failures = 0
+        self._okt = None
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        if time.monotonic() < self._unavailable_until:
+            return None
+        try:
+            self.authkey = self.authkey or load_authkey()
+            conn = Client(self.address, authkey=self.authkey)
+        except (OSError, AuthenticationError, EOFError) as e:
+            # 인증 실패/연결 끊김은 인증 키가 다르거나 다른 프로그램이 포트를 쓰는 경우이므로 서비스를 새로 띄우지 않음
+            print(f"형태소 분석 서비스에 연결할 수 없습니다: {type(e).__name__}: {e}")
+            self._unavailable_until = time.monotonic() + self.retry_interval
+            if isinstance(e, ConnectionRefusedError):
+                self._start_service()
+            return None
+        self._spawn_failures = 0
+        self._local.conn = conn
+        return conn
+
+    def _disconnect(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def _start_service(self):
+        """
+        서비스 프로세스를 백그라운드로 실행합니다. (JVM 기동 중에는 직접 분석)
+        이전에 실행한 프로세스가 비정상 종료한 횟수가 MAX_SPAWN_FAILURES에 이르면 더 이상 실행하지 않습니다.
+        """
+        if not self.autostart:
+            return
+        with self._lock:
+            if self._spawned is not None:
+                returncode = self._spawned.poll()
+                if returncode is None:
+                    return
+                if returncode != 0:
+                    self._spawn_failures += 1
+                    print(f"형태소 분석 서비스가 종료되었습니다 (코드 {returncode}). 원인은 {SERVICE_LOG_PATH} 참고")
+                self._spawned = None
+            if self._spawn_failures >= MAX_SPAWN_FAILURES:
+                return
+            os.makedirs(os.path.dirname(SERVICE_LOG_PATH), exist_ok=True)
+            with open(SERVICE_LOG_PATH, 'ab') as log_file:
+                self._spawned = subprocess.Popen(
+                    [sys.executable, '-m', 'modules.tokenizer_service', '--port', str(self.address[1])],
+                    cwd=BASE_DIR, stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+                    start_new_session=True
+                )
+
+    def _request(self, op, payload):
+        """요청을 보내고 ('ok'|'busy'|'error', 값)을 반환합니다. 서비스를 쓸 수 없으면 None."""
+        conn = self._connect() if self.enabled else None
+        if conn is None:
+            return None
+        try:
+            conn.send((op, payload))
+            if not conn.poll(self.timeout):
+                # 늦게 도착한 응답이 다음 요청의 응답으로 읽히지 않도록 연결을 끊음
+                print(f"형태소 분석 서비스 응답이 {self.timeout}초 안에 오지 않았습니다.")
+                self._disconnect()
+                self._unavailable_until = time.monotonic() + self.retry_interval
+                return None
+            return conn.recv()
+        except (EOFError, OSError) as e:
+            print(f"형태소 분석 서비스 통신 오류: {e}")
+            self._disconnect()
+            return None
+
+    def _local_okt(self):
+        with self._lock:
+            if self._okt is None:
+                from konlpy.tag import Okt
+                self._okt = Okt()
+            return self._okt
+
+    def morphs_batch(self, texts):
+        """
+        문서 리스트를 형태소 분석합니다. (입력 순서 유지)
+        :param texts: 텍스트 리스트
+        :return: 문서별 형태소 리스트
+        """
+        texts = list(texts)
+        results = []
+        for start in range(0, len(texts), self.max_batch):
+            chunk = texts[start:start + self.max_batch]
+            response = self._request('morphs', chunk)
+            if response is not None and response[0] == 'ok':
+                results.extend(response[1])
+                continue
+            if response is not None and response[0] == 'error':
+                print(f"형태소 분석 서비스 오류: {response[1]}")
+            okt = self._local_okt()
+            results.extend(okt.morphs(text) for text in chunk)
+        return results
+
+    def morphs(self, text):
+        return self.morphs_batch([text])[0]
+
+    def stats(self):
+        """서비스 통계 (서비스를 쓸 수 없으면 None)"""
+        response = self._request('stats', None)
+        return response[1] if response is not None and response[0] == 'ok' else None
+
+    def shutdown_service(self):
+        """실행 중인 서비스를 종료합니다. :return: 종료 요청이 전달되었으면 True"""
+        response = self._request('shutdown', None)
+        self._disconnect()
+        return response is not None and response[0] == 'ok'
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_tokenizer(autostart=None):
+    """
+    프로세스 전체에서 공유하는 형태소 분석 서비스 클라이언트를 반환합니다.
+    :param autostart: 지정하면 서비스가 없을 때 백그라운드로 실행할지 설정 (일회성 스크립트는 False)
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = TokenizerClient()
+        if autostart is not None:
+            _default_client.autostart = autostart
+        return _default_client
+
+
+def morphs_batch(texts):
+    """공유 형태소 분석 서비스로 문서 리스트를 분석합니다. (입력 순서 유지)"""
+    return get_tokenizer().morphs_batch(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 형태소 분석 서비스")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--max-queue', type=int, default=MAX_QUEUE)
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT,
+                        help="연결과 요청이 없는 상태가 이 시간(초) 이어지면 종료 (0이면 종료하지 않음)")
+    parser.add_argument('--stats', action='store_true', help="실행 중인 서비스의 통계를 출력")
+    parser.add_argument('--stop', action='store_true', help="실행 중인 서비스를 종료")
+    args = parser.parse_args()
+
+    if args.stop:
+        if not TokenizerClient(port=args.port, autostart=False).shutdown_service():
+            print("실행 중인 형태소 분석 서비스가 없습니다.")
+            sys.exit(1)
+        print("형태소 분석 서비스를 종료했습니다.")
+        return
+
+    if args.stats:
+        stats = TokenizerClient(port=args.port, autostart=False).stats()
+        if stats is None:
+            print("실행 중인 형태소 분석 서비스가 없습니다.")
+            sys.exit(1)
+        for name, value in stats.items():
+            print(f"{name}: {value}")
+        return
+
+    TokenizerServer(port=args.port, max_queue=args.max_queue, idle_timeout=args.idle_timeout).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,276 @@
-from gensim import corpora
-from gensim.models import LdaModel
-from nltk.corpus import wordnet as wn
-from konlpy.tag import Okt
+from gensim import corpora, utils
+from gensim.models import LdaModel, LdaMulticore
+from modules import metrics
+from modules.model_store import ModelStore, corpus_fingerprint, document_key, sweep_stale_temp_dirs
+from modules.paths import CACHE_DIR
+from modules.token_cache import get_token_cache
+from modules.tokenizer_pool import tokenize_batch
+from modules.tokenizer_service import morphs_batch
+import itertools
+import numpy as np
+import os
 import re
+import shutil
+import tempfile
+import threading
+import time
+import weakref
 
-def preprocess_data(texts):
+# 같은 카테고리를 동시에 학습하지 않도록 카테고리별 잠금 사용
+_training_locks = {}
+_training_locks_guard = threading.Lock()
+
+# 워드클라우드에 표시할 토픽별 상위 단어 수
+WORDCLOUD_TOPN = 10
+
+# 이 개수 이상의 문서를 새로 분석할 때만 프로세스 풀을 사용 (워커 JVM 기동 비용 때문)
+PARALLEL_MIN_DOCS = 64
+
+# 학습용 BOW 코퍼스를 임시로 직렬화하는 디렉터리
+CORPUS_TMP_DIR = os.path.join(CACHE_DIR, 'corpora')
+
+# 증분 학습에서 기존 문서의 문서-토픽 행을 재사용하다가, 이 횟수만큼 갱신했거나
+# 그동안 누적된 기존 통계 감쇠(history_decay의 곱)가 이 값 미만이면 전체 문서를 다시 추론
+DOC_TOPICS_REFRESH_UPDATES = 5
+DOC_TOPICS_REFRESH_DECAY = 0.5
+
+@metrics.timed('tokenize')
+def preprocess_data(texts, cache=None, workers=None):
     """
     텍스트 전처리 및 토큰화
+    형태소 분석 결과는 토큰 캐시에 저장되며, 이미 분석한 문서는 Okt를 다시 호출하지 않습니다.
+    새로 분석할 문서가 많으면 프로세스 풀에서 병렬로, 적으면 공유 형태소 분석 서비스로 분석합니다.
+    :param texts: 문서 텍스트 리스트
+    :param cache: TokenCache 인스턴스 (기본값: 공유 캐시)
+    :param workers: 프로세스 풀 워커 수 (기본값: CPU 코어 수 - 1, 1이면 병렬 처리 안 함)
+    :return: 문서별 토큰 리스트
     """
-    okt = Okt()
-    tokenized_texts = []
-    for text in texts:
-        text = re.sub(r'[^가-힣\s]', '', text).strip()
-        tokens = [word for word in okt.morphs(text) if len(word) > 1]
-        tokenized_texts.append(tokens)
-    return tokenized_texts
+    cache = cache or get_token_cache()
+    cleaned_texts = [re.sub(r'[^가-힣\s]', '', text).strip() for text in texts]
+    keys = [cache.make_key(text) for text in cleaned_texts]
 
-def perform_lda(tokenized_texts, num_topics=5, passes=15):
+    morphs = cache.get_many(keys)
+    missing = {key: text for key, text in zip(keys, cleaned_texts) if key not in morphs}
+    if missing:
+        with metrics.span('okt_morphs', docs='batch' if len(missing) >= PARALLEL_MIN_DOCS else 'small'):
+            if len(missing) >= PARALLEL_MIN_DOCS and workers != 1:
+                analyzed = dict(zip(missing, tokenize_batch(list(missing.values()), workers=workers)))
+            else:
+                # 적은 양은 공유 형태소 분석 서비스로 처리 (JVM 워밍업 비용 없음)
+                analyzed = dict(zip(missing, morphs_batch(list(missing.values()))))
+        cache.put_many(analyzed)
+        morphs.update(analyzed)
+
+    print(f"토큰 캐시: 적중 {len(set(keys)) - len(missing)}건, 미스 {len(missing)}건")
+
+    return [[word for word in morphs[key] if len(word) > 1] for key in keys]
+
+def build_dictionary(tokenized_texts, no_below=2, no_above=0.5, keep_n=50000):
     """
-    LDA 모델 학습
+    사전을 만들고 문서 빈도로 어휘를 정리합니다.
+    :param no_below: 이 개수보다 적은 문서에 나온 단어 제거
+    :param no_above: 이 비율보다 많은 문서에 나온 단어 제거
+    :param keep_n: 남길 최대 단어 수 (문서 빈도 순)
     """
     dictionary = corpora.Dictionary(tokenized_texts)
-    corpus = [dictionary.doc2bow(text) for text in tokenized_texts]
-    lda_model = LdaModel(corpus=corpus, num_topics=num_topics, id2word=dictionary, passes=passes)
+    num_terms = len(dictionary)
+    # no_above로 제거되는 단어는 사전과 함께 저장해 증분 학습(update_lda)에서 다시 추가되지 않게 함
+    frequent_tokens = _frequent_tokens(dictionary, range(num_terms), no_above)
+    dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=keep_n)
+    if num_terms and not len(dictionary):
+        # 문서가 너무 적어 모든 단어가 제거되면 정리하지 않은 사전 사용
+        print("어휘 정리 후 남은 단어가 없어 전체 어휘를 사용합니다.")
+        dictionary = corpora.Dictionary(tokenized_texts)
+        dictionary.frequent_tokens = set()
+        return dictionary
+    dictionary.frequent_tokens = frequent_tokens
+    print(f"어휘 정리: {num_terms}개 -> {len(dictionary)}개")
+    return dictionary
+
+def _frequent_tokens(dictionary, token_ids, no_above):
+    """token_ids 중 전체 문서의 no_above 비율보다 많은 문서에 나온 단어 (filter_extremes와 같은 기준)"""
+    no_above_abs = int(no_above * dictionary.num_docs)
+    return {dictionary[token_id] for token_id in token_ids if dictionary.dfs.get(token_id, 0) > no_above_abs}
+
+def serialize_corpus(dictionary, tokenized_texts, path=None):
+    """
+    BOW 코퍼스를 Matrix Market 파일로 기록하고 디스크에서 스트리밍하는 MmCorpus를 반환합니다.
+    path를 지정하지 않으면 임시 디렉터리에 기록하며, 반환된 코퍼스 객체가 사라질 때 함께 삭제됩니다.
+    """
+    return write_corpus((dictionary.doc2bow(text) for text in tokenized_texts), path)
+
+def write_corpus(bows, path=None):
+    """BOW 문서들(이터러블)을 Matrix Market 파일로 기록합니다. (serialize_corpus 참고)"""
+    tmp_dir = None
+    if path is None:
+        os.makedirs(CORPUS_TMP_DIR, exist_ok=True)
+        sweep_stale_temp_dirs(CORPUS_TMP_DIR)  # 학습 도중 종료된 프로세스가 남긴 임시 코퍼스 정리
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=CORPUS_TMP_DIR)
+        path = os.path.join(tmp_dir, 'corpus.mm')
+    corpora.MmCorpus.serialize(path, bows)
+    corpus = corpora.MmCorpus(path)
+    if tmp_dir is not None:
+        weakref.finalize(corpus, shutil.rmtree, tmp_dir, True)
+    return corpus
+
+@metrics.timed('lda_train')
+def perform_lda(tokenized_texts, num_topics=5, passes=15, workers=None, tol=None, convergence="perplexity",
+                no_below=2, no_above=0.5, keep_n=50000, chunksize=2000):
+    """
+    LDA 모델 학습
+    사전은 문서 빈도로 어휘를 정리하고(build_dictionary), 코퍼스는 디스크에 기록한 뒤 chunksize 문서씩 읽으며 학습합니다.
+    :param workers: 2 이상이면 gensim LdaMulticore로 병렬 학습 (None/1이면 단일 코어 LdaModel)
+    :param tol: 설정하면 한 패스씩 학습하면서 변화량이 tol 미만일 때 조기 종료 (최대 passes회)
+    :param convergence: "perplexity"(log perplexity 상대 변화) 또는 "topics"(토픽-단어 분포 평균 변화)
+                        perplexity는 매 패스 전체 코퍼스 대신 앞쪽 chunksize개 문서(고정)로만 계산
+    :param no_below, no_above, keep_n: 어휘 정리 기준
+    :param chunksize: 한 번에 메모리에 올려 학습하는 문서 수
+    학습 결과(실제 사용한 패스 수, 소요 시간 등)는 lda_model.training_stats에 기록됩니다.
+    :return: lda_model, corpus(MmCorpus), dictionary, topics
+    """
+    dictionary = build_dictionary(tokenized_texts, no_below=no_below, no_above=no_above, keep_n=keep_n)
+    corpus = serialize_corpus(dictionary, tokenized_texts)
+
+    def create_model(model_passes):
+        if workers and workers > 1:
+            return LdaMulticore(corpus=corpus, num_topics=num_topics, id2word=dictionary,
+                                passes=model_passes, workers=workers, chunksize=chunksize)
+        return LdaModel(corpus=corpus, num_topics=num_topics, id2word=dictionary, passes=model_passes,
+                        chunksize=chunksize)
+
+    start_time = time.perf_counter()
+    converged = False
+    if tol is None:
+        lda_model = create_model(passes)
+        passes_used = passes
+    else:
+        # 한 패스씩 학습하며 수렴 여부 확인 (평가용 문서는 한 번만 읽어 둠)
+        eval_corpus = list(itertools.islice(corpus, chunksize)) if convergence == "perplexity" else None
+        lda_model = create_model(1)
+        passes_used = 1
+        previous = _convergence_measure(lda_model, eval_corpus, convergence)
+        while passes_used < passes:
+            lda_model.update(corpus)
+            passes_used += 1
+            current = _convergence_measure(lda_model, eval_corpus, convergence)
+            if convergence == "perplexity":
+                change = abs(current - previous) / max(abs(previous), 1e-12)
+            else:
+                change = float(np.abs(current - previous).mean())
+            previous = current
+            if change < tol:
+                converged = True
+                break
+
+    lda_model.training_stats = {
+        'mode': 'multicore' if workers and workers > 1 else 'single',
+        'workers': workers or 1,
+        'passes_used': passes_used,
+        'max_passes': passes,
+        'converged': converged,
+        'seconds': round(time.perf_counter() - start_time, 3),
+    }
+    print(f"LDA 학습 완료: {lda_model.training_stats}")
+
     topics = lda_model.show_topics(num_topics=num_topics, num_words=5, formatted=True)
     return lda_model, corpus, dictionary, topics
 
+@metrics.timed('doc_topic_matrix')
+def document_topic_matrix(lda_model, corpus, chunksize=2000):
+    """
+    전체 문서의 토픽 분포를 (문서 수, 토픽 수) 크기의 NumPy 배열로 계산합니다.
+    문서별 get_document_topics 호출 대신 묶음 단위 추론(inference)을 사용하며, 코퍼스는 chunksize씩 읽습니다.
+    """
+    chunks = []
+    for chunk in utils.grouper(corpus, chunksize):
+        gamma, _ = lda_model.inference(chunk)
+        chunks.append((gamma / gamma.sum(axis=1, keepdims=True)).astype(np.float32))
+    if not chunks:
+        return np.zeros((0, lda_model.num_topics), dtype=np.float32)
+    return np.vstack(chunks)
+
+@metrics.timed('lda_update')
+def update_lda(lda_model, dictionary, new_tokenized_texts, history_decay=1.0, passes=1, no_below=2, no_above=0.5,
+               keep_n=50000):
+    """
+    기존 LDA 모델에 새 문서만 온라인 학습으로 반영합니다.
+    새 단어는 사전에 추가되고 모델의 토픽-단어 행렬도 그만큼 확장됩니다.
+    기존 단어 ID가 바뀌면 모델 행렬과 맞지 않으므로 어휘 정리는 새로 추가된 단어에만 적용합니다.
+    :param lda_model: 이전에 학습된 LDA 모델 (제자리에서 갱신)
+    :param dictionary: 이전 모델의 사전 (제자리에서 확장, 기존 단어 ID는 유지)
+    :param new_tokenized_texts: 새 문서의 토큰 리스트
+    :param history_decay: 갱신 전에 기존 토픽-단어 통계에 곱할 값 (1.0이면 감쇠 없음)
+    :param passes: 새 문서에 대한 학습 반복 횟수
+    :param no_below: 새 단어 중 이번 문서들에서 이 개수보다 적은 문서에 나온 단어는 추가하지 않음
+    :param no_above: 새 단어 중 누적 문서의 이 비율보다 많은 문서에 나온 단어와
+                     처음 학습할 때 이 기준으로 제거된 단어(dictionary.frequent_tokens)는 추가하지 않음
+    :param keep_n: 사전 최대 단어 수 (넘으면 문서 빈도가 낮은 새 단어부터 제외)
+    :return: 새 문서의 BOW 코퍼스
+    """
+    num_terms = len(dictionary)
+    dictionary.add_documents(new_tokenized_texts)
+    _prune_new_terms(dictionary, num_terms, no_below, no_above, keep_n)
+    _grow_vocabulary(lda_model, dictionary)
+
+    if history_decay < 1.0:
+        # 오래된 문서의 영향력을 줄임
+        lda_model.state.sstats *= history_decay
+        lda_model.sync_state()
+
+    new_corpus = [dictionary.doc2bow(text) for text in new_tokenized_texts]
+    if new_corpus:
+        lda_model.update(new_corpus, passes=passes)
+    return new_corpus
+
+def _prune_new_terms(dictionary, num_terms, no_below, no_above, keep_n):
+    """
+    ID가 num_terms 이상인 (이번에 추가된) 단어만 정리합니다.
+    gensim은 제거 후 ID를 정렬 순서대로 다시 매기므로 기존 단어(0 ~ num_terms-1)의 ID는 그대로 유지됩니다.
+    새 단어의 문서 빈도는 이번 문서들에서만 센 값이므로 no_above는 누적 문서 수(num_docs) 기준으로 확인하고,
+    이전에 no_above로 제거된 단어는 frequent_tokens로 걸러냅니다. (이전 버전 사전에는 없으므로 빈 집합)
+    """
+    new_ids = range(num_terms, len(dictionary))
+    frequent_tokens = getattr(dictionary, 'frequent_tokens', set())
+    frequent_tokens |= _frequent_tokens(dictionary, new_ids, no_above)
+    dictionary.frequent_tokens = frequent_tokens
+
+    new_ids = sorted(new_ids, key=lambda token_id: -dictionary.dfs.get(token_id, 0))
+    bad_ids = [token_id for token_id in new_ids
+               if dictionary.dfs.get(token_id, 0) < no_below or dictionary[token_id] in frequent_tokens]
+    kept = [token_id for token_id in new_ids
+            if dictionary.dfs.get(token_id, 0) >= no_below and dictionary[token_id] not in frequent_tokens]
+    bad_ids += kept[max(keep_n - num_terms, 0):]
+    if bad_ids:
+        dictionary.filter_tokens(bad_ids=bad_ids)
+
+def _grow_vocabulary(lda_model, dictionary):
+    """사전에 새로 추가된 단어만큼 모델의 토픽-단어 통계와 사전 분포(eta)를 확장합니다."""
+    added = len(dictionary) - lda_model.num_terms
+    if added <= 0:
+        return
+
+    # 새 단어는 gensim 초기화와 같은 방식(감마 분포)으로 통계를 채움
+    new_sstats = lda_model.random_state.gamma(100., 1. / 100., (lda_model.num_topics, added))
+    lda_model.state.sstats = np.hstack([lda_model.state.sstats, new_sstats.astype(lda_model.state.sstats.dtype)])
+
+    eta = lda_model.eta
+    if eta.ndim == 1:
+        eta = np.concatenate([eta, np.full(added, eta.mean(), dtype=eta.dtype)])
+    else:
+        eta = np.hstack([eta, np.full((eta.shape[0], added), eta.mean(), dtype=eta.dtype)])
+    lda_model.eta = eta
+    lda_model.state.eta = eta
+
+    lda_model.num_terms = len(dictionary)
+    lda_model.id2word = dictionary
+    lda_model.sync_state()
+
+def _convergence_measure(lda_model, eval_corpus, convergence):
+    """수렴 판단 지표: 평가용 문서의 log perplexity 또는 토픽-단어 분포 행렬"""
+    if convergence == "perplexity":
+        return lda_model.log_perplexity(eval_corpus)
+    return lda_model.get_topics()
+
 def generate_topic_labels(lda_model, num_topics, topn=5):
     """
     토픽 키워드를 기반으로 주제를 자동 생성합니다.
@@ -47,6 +292,7 @@ def generate_topic_labels(lda_model, num_topics, topn=5):
 
     return topic_labels
 
+@metrics.timed('topic_labels')
 def generate_topic_labels_with_context(lda_model, num_topics, topn=5, language="kor"):
     """
     WordNet 또는 KorLex를 사용하여 자연스러운 주제를 생성합니다.
@@ -57,12 +303,18 @@ def generate_topic_labels_with_context(lda_model, num_topics, topn=5, language="
     :return: 생성된 토픽 주제 리스트
     """
     topic_labels = []
+    # 토픽별 상위 키워드 추출
+    topic_keywords = [[term for term, _ in lda_model.show_topic(topic_id, topn=topn)]
+                      for topic_id in range(num_topics)]
 
-    for topic_id in range(num_topics):
-        # 상위 키워드 추출
-        topic_terms = lda_model.show_topic(topic_id, topn=topn)
-        keywords = [term for term, _ in topic_terms]
+    if language == "eng":
+        from nltk.corpus import wordnet as wn
+    else:
+        # 모든 토픽의 키워드를 공유 형태소 분석 서비스에 한 번에 보냄
+        all_keywords = [keyword for keywords in topic_keywords for keyword in keywords]
+        analyzed = dict(zip(all_keywords, morphs_batch(all_keywords)))
 
+    for topic_id, keywords in enumerate(topic_keywords):
         if language == "eng":
             # WordNet 기반 주제 생성
             related_words = []
@@ -76,10 +328,189 @@ def generate_topic_labels_with_context(lda_model, num_topics, topn=5, language="
                 label += f" ({', '.join(related_words)})"
         else:
             # KorLex 기반 주제 생성
-            okt = Okt()
-            analyzed_keywords = [" ".join(okt.morphs(keyword)) for keyword in keywords]
+            analyzed_keywords = [" ".join(analyzed[keyword]) for keyword in keywords]
             label = f"{analyzed_keywords[0]} | {', '.join(analyzed_keywords[1:])}"
 
         topic_labels.append(f"{topic_id + 1}. {label}")
 
-    return topic_labels
\ No newline at end of file
+    return topic_labels
+
+def load_or_train_topic_model(category, texts, num_topics=5, passes=15, topn=5, language="kor", store=None,
+                              workers=None, tol=None, convergence="perplexity", incremental=False,
+                              history_half_life=None, no_below=2, no_above=0.5, keep_n=50000, chunksize=2000):
+    """
+    저장된 LDA 산출물을 불러오고, 데이터나 파라미터가 바뀐 경우에만 다시 학습합니다.
+    :param category: 뉴스 카테고리 이름
+    :param texts: 카테고리 문서 텍스트 리스트 (processed_body)
+    :param store: ModelStore 인스턴스 (기본값: 프로젝트 models 디렉터리)
+    :param workers, tol, convergence: perform_lda의 멀티코어/조기 종료 설정
+    :param incremental: True이면 이전 모델에 새 문서만 온라인 학습으로 반영 (이전 모델이 없으면 전체 학습)
+    :param history_half_life: 증분 학습 시 기존 문서 영향력의 반감기(일). None이면 감쇠 없음
+    :param no_below, no_above, keep_n: 어휘 정리 기준 (build_dictionary)
+    :param chunksize: 학습 시 한 번에 읽는 문서 수
+    :return: lda_model, corpus, dictionary, topic_labels, meta를 담은 딕셔너리
+    """
+    store = store or ModelStore()
+    lda_options = {'num_topics': num_topics, 'passes': passes, 'workers': workers, 'tol': tol,
+                   'convergence': convergence, 'no_below': no_below, 'no_above': no_above, 'keep_n': keep_n,
+                   'chunksize': chunksize}
+    key = corpus_fingerprint(texts, topn=topn, language=language, multicore=bool(workers and workers > 1),
+                             tol=tol, convergence=convergence, num_topics=num_topics, passes=passes,
+                             no_below=no_below, no_above=no_above, keep_n=keep_n, chunksize=chunksize,
+                             incremental=incremental, history_half_life=history_half_life)
+
+    with _training_locks_guard:
+        lock = _training_locks.setdefault(category, threading.Lock())
+
+    with lock:
+        with metrics.span('model_load'):
+            artifacts = store.load(category, key)
+        if artifacts is not None:
+            metrics.inc('cache_hits', cache='models')
+            if artifacts['doc_topics'] is None:
+                artifacts['doc_topics'] = document_topic_matrix(artifacts['lda_model'], artifacts['corpus'])
+            return artifacts
+
+        if incremental:
+            previous_key = store.latest(category, num_topics=num_topics, topn=topn, language=language)
+            previous = store.load(category, previous_key) if previous_key else None
+            if previous is not None and previous['doc_keys']:
+                return _update_topic_model(category, key, texts, previous, lda_options, topn, language, store,
+                                           history_half_life)
+
+        return _train_topic_model(category, key, texts, lda_options, topn, language, store)
+
+
+def _train_topic_model(category, key, texts, lda_options, topn, language, store):
+    """LDA 모델을 학습하고 산출물을 저장합니다."""
+    tokenized_texts = preprocess_data(texts)
+    lda_model, corpus, dictionary, _ = perform_lda(tokenized_texts, **lda_options)
+    return _save_topic_model(category, key, texts, lda_model, corpus, dictionary, lda_options, topn, language, store)
+
+
+def _update_topic_model(category, key, texts, previous, lda_options, topn, language, store, history_half_life):
+    """
+    이전 모델에 새 문서만 반영하고 산출물을 저장합니다.
+    전처리, 학습, 문서-토픽 계산은 새 문서에만 하고, 기존 문서의 BOW/문서-토픽 행은 이전 산출물에서 가져옵니다.
+    재사용한 문서-토픽 행은 그 문서를 처음 추론한 모델 기준이라 갱신이 쌓일수록 현재 토픽과 어긋나므로,
+    DOC_TOPICS_REFRESH_UPDATES번째 갱신마다 또는 누적 감쇠가 DOC_TOPICS_REFRESH_DECAY 미만이 되면
+    전체 문서를 다시 추론합니다. (그 갱신만 비용이 전체 문서 수에 비례)
+    """
+    start_time = time.perf_counter()
+    previous_rows = {doc_key: row for row, doc_key in enumerate(previous['doc_keys'])}
+    doc_keys = [document_key(text) for text in texts]
+    new_texts = [text for text, doc_key in zip(texts, doc_keys) if doc_key not in previous_rows]
+    new_tokenized_texts = preprocess_data(new_texts) if new_texts else []
+
+    history_decay = 1.0
+    if history_half_life:
+        elapsed_days = (time.time() - previous['meta']['created_at']) / 86400
+        history_decay = 0.5 ** (elapsed_days / history_half_life)
+
+    lda_model = previous['lda_model']
+    dictionary = previous['dictionary']
+    new_corpus = update_lda(lda_model, dictionary, new_tokenized_texts, history_decay=history_decay,
+                            no_below=lda_options['no_below'], no_above=lda_options['no_above'],
+                            keep_n=lda_options['keep_n'])
+
+    # 마지막 전체 추론 이후 갱신 횟수와 누적 감쇠 (전체 학습한 모델은 0회, 1.0)
+    previous_stats = previous['meta'].get('training_stats') or {}
+    update_depth = previous_stats.get('update_depth', 0) + 1
+    cumulative_decay = previous_stats.get('cumulative_decay', 1.0) * history_decay
+    refresh_doc_topics = (previous['doc_topics'] is None or update_depth >= DOC_TOPICS_REFRESH_UPDATES
+                          or cumulative_decay < DOC_TOPICS_REFRESH_DECAY)
+
+    lda_model.training_stats = {
+        'mode': 'incremental',
+        'base_key': previous['meta']['key'],
+        'new_docs': len(new_tokenized_texts),
+        'history_decay': round(history_decay, 4),
+        'update_depth': 0 if refresh_doc_topics else update_depth,
+        'cumulative_decay': 1.0 if refresh_doc_topics else cumulative_decay,
+        'doc_topics_refreshed': refresh_doc_topics,
+        'seconds': round(time.perf_counter() - start_time, 3),
+    }
+    print(f"LDA 증분 학습 완료: {lda_model.training_stats}")
+
+    # 현재 문서 순서대로 코퍼스와 문서-토픽 행렬 구성 (기존 문서는 이전 산출물의 행을 그대로 사용,
+    # 기존 단어 ID는 update_lda에서 유지되므로 이전 BOW 행도 그대로 유효)
+    previous_corpus = previous['corpus']
+    new_rows = iter(new_corpus)
+    corpus = write_corpus(
+        previous_corpus[previous_rows[doc_key]] if doc_key in previous_rows else next(new_rows)
+        for doc_key in doc_keys
+    )
+    doc_topics = None  # 전체 재추론은 _save_topic_model에서 저장할 코퍼스로 계산
+    if not refresh_doc_topics:
+        known = [i for i, doc_key in enumerate(doc_keys) if doc_key in previous_rows]
+        unseen = [i for i, doc_key in enumerate(doc_keys) if doc_key not in previous_rows]
+        doc_topics = np.empty((len(doc_keys), lda_model.num_topics), dtype=np.float32)
+        doc_topics[known] = previous['doc_topics'][[previous_rows[doc_keys[i]] for i in known]]
+        doc_topics[unseen] = document_topic_matrix(lda_model, new_corpus)
+    return _save_topic_model(category, key, texts, lda_model, corpus, dictionary, lda_options, topn, language, store,
+                             doc_topics=doc_topics)
+
+
+def _save_topic_model(category, key, texts, lda_model, corpus, dictionary, lda_options, topn, language, store,
+                      doc_topics=None):
+    """
+    토픽 라벨을 생성하고 산출물을 저장합니다.
+    :param doc_topics: 미리 구성한 문서-토픽 행렬 (없으면 전체 코퍼스로 계산)
+    """
+    num_topics = lda_options['num_topics']
+    topic_labels = generate_topic_labels_with_context(lda_model, num_topics=num_topics, topn=topn, language=language)
+
+    doc_keys = [document_key(text) for text in texts]
+    if doc_topics is None:
+        doc_topics = document_topic_matrix(lda_model, corpus)
+    meta = dict(lda_options, topn=topn, language=language, num_docs=len(texts),
+                training_stats=lda_model.training_stats)
+    wordclouds = _render_wordclouds(lda_model, num_topics)
+    with metrics.span('model_save'):
+        store.save(category, key, lda_model, dictionary, corpus, topic_labels, meta=meta, doc_keys=doc_keys,
+                   doc_topics=doc_topics, wordclouds=wordclouds)
+    store.prune(category)
+
+    return {
+        'lda_model': lda_model,
+        'corpus': store.load_corpus(category, key),  # 임시 코퍼스 대신 산출물과 함께 저장된 파일 사용
+        'dictionary': dictionary,
+        'topic_labels': topic_labels,
+        'meta': dict(meta, key=key, category=category, created_at=time.time()),
+        'doc_keys': doc_keys,
+        'doc_topics': doc_topics,
+    }
+
+
+@metrics.timed('wordcloud_render')
+def _render_wordclouds(lda_model, num_topics, topn=WORDCLOUD_TOPN):
+    """
+    모든 토픽의 워드클라우드를 생성합니다. 실패해도 모델 저장은 계속합니다.
+    한글 폰트가 없으면 생성하지 않으며(None), 폰트가 생긴 뒤 load_topic_wordclouds가 채워 넣습니다.
+    """
+    from modules.wordcloud_images import topic_wordcloud_pngs
+    try:
+        images = topic_wordcloud_pngs(lda_model, num_topics, topn=topn)
+        if images is None:
+            print("한글 폰트가 없어 워드클라우드를 저장하지 않습니다.")
+        return images
+    except Exception as e:
+        print(f"워드클라우드 생성 중 오류 발생: {e}")
+        return None
+
+
+def load_topic_wordclouds(category, artifacts, store=None):
+    """
+    모델 산출물과 함께 저장된 토픽별 워드클라우드 PNG를 반환합니다.
+    저장된 이미지가 없으면 (이전 버전 산출물) 생성해서 산출물 옆에 저장합니다.
+    :return: 토픽 순서대로 PNG 바이트 리스트 (생성에 실패하면 None)
+    """
+    store = store or ModelStore()
+    key = artifacts['meta']['key']
+    num_topics = artifacts['lda_model'].num_topics
+    images = store.load_wordclouds(category, key, num_topics)
+    if images is None:
+        images = _render_wordclouds(artifacts['lda_model'], num_topics)
+        if images is not None:
+            store.save_wordclouds(category, key, images)
+    return images
@@ -1,19 +1,83 @@
+import re
+import numpy as np
+import pandas as pd
 import streamlit as st
 
-def convert_price(price_str):
-    """가격 문자열을 정수로 변환"""
-    try:
-        price_str = price_str.replace(' ', '').replace(',', '')  # 공백과 콤마 제거
-        if '억' in price_str:
-            parts = price_str.split('억')
-            return int(parts[0]) * 100000000 + (int(parts[1]) * 10000 if len(parts) > 1 and parts[1] else 0)
-        elif '만' in price_str:
-            return int(price_str.split('만')[0]) * 10000
-        else:
-            return int(price_str)
-    except Exception as e:
-        st.error(f"가격 변환 오류: {e}")
+# 네이버 부동산 hanPrc 형식: "14억 5,000", "10억", "9,000" (억 이하 숫자는 만원 단위)
+PRICE_PATTERN = r'^(?:(?P<eok>\d+)억)?(?:(?P<man>\d+)만?)?$'
+_price_regex = re.compile(PRICE_PATTERN)
+# 자릿수 상한: 원 단위로 바꿔도 int64(약 9.2 × 10^18)를 넘지 않도록 (억 10자리 × 10^8, 만원 12자리 × 10^4)
+MAX_EOK_DIGITS = 10
+MAX_MAN_DIGITS = 12
+
+
+def parse_price_series(prices):
+    """
+    가격 문자열 Series를 한 번에 정수(원)로 변환합니다. (parse_price와 같은 규칙)
+    문자열을 유니코드 코드 배열로 바꾼 뒤 글자 위치별로 NumPy 연산을 적용하므로 행마다 파이썬 함수를 호출하지 않습니다.
+    :param prices: '14억 5,000' 같은 문자열 Series
+    :return: (변환된 nullable Int64 Series, 변환에 실패한 행 수)
+    """
+    values = prices.to_numpy(dtype=object)
+    text = np.asarray(np.where(pd.isna(values), '', values), dtype=str)
+    width = max(text.dtype.itemsize // 4, 1)
+    codes = text.view(np.uint32).reshape(len(text), width)
+
+    size = len(text)
+    eok = np.zeros(size, dtype=np.int64)  # 억 앞의 숫자
+    current = np.zeros(size, dtype=np.int64)  # 현재 읽는 숫자 (억 뒤에서는 만원 단위)
+    digits = np.zeros(size, dtype=np.int64)
+    seen_eok = np.zeros(size, dtype=bool)
+    seen_man = np.zeros(size, dtype=bool)
+    valid = np.ones(size, dtype=bool)
+
+    for column in range(width):
+        code = codes[:, column].astype(np.int64)
+        is_digit = (code >= ord('0')) & (code <= ord('9'))
+        is_eok = code == ord('억')
+        is_man = code == ord('만')
+        is_skip = (code == 0) | (code == ord(' ')) | (code == ord(',')) | (code == ord('\t'))
+
+        valid &= is_digit | is_eok | is_man | is_skip
+        valid &= ~(is_digit & seen_man)  # '만' 뒤에는 숫자가 올 수 없음
+        valid &= ~(is_eok & (seen_eok | seen_man | (digits == 0) | (digits > MAX_EOK_DIGITS)))
+        valid &= ~(is_man & (seen_man | (digits == 0)))
+
+        digits += is_digit
+        valid &= digits <= max(MAX_EOK_DIGITS, MAX_MAN_DIGITS)  # 너무 긴 숫자는 누적 중 넘칠 수 있으므로 바로 제외
+        current = np.where(is_digit & valid, current * 10 + (code - ord('0')), current)
+        eok = np.where(is_eok, current, eok)
+        current = np.where(is_eok, 0, current)
+        digits = np.where(is_eok, 0, digits)
+        seen_eok |= is_eok
+        seen_man |= is_man
+
+    valid &= (seen_eok | (digits > 0)) & (digits <= MAX_MAN_DIGITS)
+    converted = pd.Series(eok * 100000000 + current * 10000, index=prices.index, dtype='Int64').mask(~valid)
+    return converted, int((~valid).sum())
+
+
+def parse_price(price_str):
+    """
+    '14억 5000' 같은 문자열을 숫자로 변환 (parse_price_series와 같은 규칙)
+    변환할 수 없으면 None, 문자열이 아니면 그대로 반환합니다.
+    """
+    if not isinstance(price_str, str):
+        return price_str
+    match = _price_regex.match(re.sub(r'[\s,]', '', price_str))
+    if not match or not any(match.groups()):
+        return None
+    if len(match.group('eok') or '') > MAX_EOK_DIGITS or len(match.group('man') or '') > MAX_MAN_DIGITS:
         return None
+    return int(match.group('eok') or 0) * 100000000 + int(match.group('man') or 0) * 10000
+
+
+def convert_price(price_str):
+    """가격 문자열을 정수로 변환 (실패 시 오류 표시 후 None)"""
+    price = parse_price(price_str)
+    if price is None:
+        st.error(f"가격 변환 오류: {price_str}")
+    return price
 
 
 def format_price(price):
@@ -37,24 +101,3 @@ def format_price(price):
         return f"{tens_of_thousands}만원"
     else:  # 만원 미만
         return f"{price}원"
-
-def parse_price(price_str):
-    """
-    '14억 5000만' 같은 문자열을 숫자로 변환
-    """
-    if isinstance(price_str, str):
-        try:
-            # 억과 만을 숫자로 변환
-            price_str = price_str.replace(',', '').replace(' ', '')
-            if '억' in price_str:
-                parts = price_str.split('억')
-                billions = int(parts[0]) * 100000000
-                millions = int(parts[1]) * 10000 if len(parts) > 1 and parts[1] else 0
-                return billions + millions
-            elif '만' in price_str:
-                return int(price_str.replace('만', '')) * 10000
-            else:
-                return int(price_str)
-        except ValueError:
-            return None
-    return price_str
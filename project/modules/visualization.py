@@ -1,18 +1,23 @@
-import matplotlib.pyplot as plt
+import os
 import random
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
-import seaborn as sns
-from modules.utils import convert_price, parse_price
-from wordcloud import WordCloud
+from modules import metrics
 from io import BytesIO
 
+# wordcloud, matplotlib, seaborn은 임포트 비용이 커서 사용하는 함수 안에서 불러옵니다.
+
 
 def generate_wordcloud_image(lda_model, dictionary, topic_id, topn=10, font_path=None):
     """
     WordCloud 이미지를 생성합니다.
+    :param font_path: 한글 폰트 경로 (None이면 WORDCLOUD_FONT 환경 변수 또는 시스템 폰트에서 찾음)
+    :return: PNG 이미지 (BytesIO)
     """
+    from modules.wordcloud_images import render_wordcloud_png
+
     # LDA 모델에서 토픽의 단어-가중치 데이터 추출
     topic_terms = lda_model.show_topic(topic_id, topn=topn)
     if not topic_terms:
@@ -20,48 +25,51 @@ def generate_wordcloud_image(lda_model, dictionary, topic_id, topn=10, font_path
         return None
 
     word_frequencies = {term: weight for term, weight in topic_terms}
+    image = render_wordcloud_png(word_frequencies, font_path)
+    if image is None:
+        st.warning("한글 폰트를 찾지 못해 워드클라우드를 표시할 수 없습니다. WORDCLOUD_FONT 환경 변수로 폰트 경로를 지정하세요.")
+        return None
+    return BytesIO(image)
 
-    # WordCloud 생성
-    wordcloud = WordCloud(
-        width=800,
-        height=400,
-        background_color="white",
-        colormap="viridis",
-        font_path=font_path or "/Library/Fonts/AppleGothic.ttf"  # 기본 폰트 설정
-    ).generate_from_frequencies(word_frequencies)
-
-    # 이미지를 BytesIO에 저장
-    img_buffer = BytesIO()
-    plt.figure(figsize=(10, 5))
-    plt.imshow(wordcloud, interpolation="bilinear")
-    plt.axis("off")
-    plt.savefig(img_buffer, format="png", bbox_inches="tight")
-    img_buffer.seek(0)
-    plt.close()
 
-    return img_buffer
+def top_related_documents(doc_topics, topic_id, topn=10, min_weight=0.2):
+    """
+    문서-토픽 행렬에서 선택된 토픽의 가중치가 높은 문서를 찾습니다.
+    :param doc_topics: (문서 수, 토픽 수) 문서-토픽 분포 행렬
+    :param topic_id: 선택된 토픽 ID
+    :param topn: 최대 문서 수
+    :param min_weight: 최소 가중치 기준
+    :return: 가중치 내림차순으로 정렬된 문서 인덱스 배열
+    """
+    weights = np.asarray(doc_topics)[:, topic_id]
+    candidates = np.flatnonzero(weights > min_weight)
+    if len(candidates) > topn:
+        candidates = candidates[np.argpartition(-weights[candidates], topn - 1)[:topn]]
+    return candidates[np.argsort(-weights[candidates], kind="stable")]
 
 
-def display_related_articles(lda_model, corpus, topic_id, articles):
+def display_related_articles(lda_model, corpus, topic_id, articles, doc_topics=None):
     """
     선택된 토픽과 관련된 기사를 Streamlit에 표시합니다.
     :param lda_model: 학습된 LDA 모델
     :param corpus: Gensim 코퍼스 (문서의 BOW 표현)
     :param topic_id: 선택된 토픽 ID
     :param articles: 기사 데이터 (리스트 형식, 각 문서의 메타데이터 포함)
+    :param doc_topics: 미리 계산된 문서-토픽 행렬 (없으면 corpus로 계산)
     """
-    related_articles = []
+    if doc_topics is None:
+        from modules.topic_modeling import document_topic_matrix
+        doc_topics = document_topic_matrix(lda_model, corpus)
 
-    # 관련 문서 찾기
-    for doc_id, doc in enumerate(corpus):
-        doc_topics = lda_model.get_document_topics(doc)
-        for t_id, weight in doc_topics:
-            if t_id == topic_id and weight > 0.2:  # 가중치 기준
-                related_articles.append(articles[doc_id])  # 관련 기사 저장
+    # 관련 문서 찾기 (가중치 0.2 초과 중 상위 10개)
+    with metrics.span('related_articles_score'):
+        doc_ids = top_related_documents(doc_topics, topic_id)
+    with metrics.span('related_articles_read'):
+        related_articles = [articles[doc_id] for doc_id in doc_ids]
 
     # 관련 기사 표시
     if related_articles:
-        for idx, article in enumerate(related_articles[:10], start=1):  # 최대 10개 기사 표시
+        for article in related_articles:
             title = article.get('title', 'No title')
             link = article.get('link', '#')  # 링크가 없으면 기본값 #
             st.markdown(f"- **[{title}]({link})**")
@@ -70,88 +78,127 @@ def display_related_articles(lda_model, corpus, topic_id, articles):
 
 
 
+@metrics.timed('dataframe_build')
 def create_dataframe(data, transaction_type):
-    # 데이터프레임 생성
-    df = pd.DataFrame(data)
+    """
+    매물 테이블에서 선택한 거래 유형만 골라 화면 표시용 컬럼 이름으로 바꿉니다.
+    가격/면적은 수집 단계(build_listing_table)에서 이미 변환되어 있으므로 다시 파싱하지 않습니다.
+    :param data: get_apartments/get_apartments_cached가 반환한 매물 테이블 (매물 딕셔너리 리스트도 허용)
+    :param transaction_type: '매매' 또는 '전세'
+    """
+    if not isinstance(data, pd.DataFrame):
+        from modules.data_processing import build_listing_table
+        data = build_listing_table(data)
 
     # 필요한 키가 데이터에 포함되어 있는지 확인
-    required_columns = ['name', 'price', 'transaction_type', 'area', 'floor']
+    required_columns = ['name', 'price', 'transaction_type', 'area', 'floor_info']
     for col in required_columns:
-        if col not in df.columns:
+        if col not in data.columns:
             st.error(f"필수 컬럼 '{col}'이(가) 데이터에 없습니다.")
             return pd.DataFrame()  # 빈 데이터프레임 반환
 
-    # 선택한 거래 유형 필터링
-    df = df[df['transaction_type'] == transaction_type]
+    rejected = data.attrs.get('rejected_prices', 0)
+    if rejected:
+        st.warning(f"가격을 변환할 수 없는 매물 {rejected}건이 있습니다.")
 
-    # 컬럼 이름 매핑
-    df.rename(columns={
+    # 선택한 거래 유형 필터링 및 컬럼 이름 매핑
+    df = data.loc[data['transaction_type'] == transaction_type, ['name', 'price', 'transaction_type', 'area', 'floor_info']]
+    return df.rename(columns={
         'name': '단지명',
         'price': '가격',
         'area': '전용면적',
-        'floor': '현재 층/전체 층'
-    }, inplace=True)
+        'floor_info': '현재 층/전체 층'
+    })
 
-    # 가격 변환
-    try:
-        df['가격'] = df['가격'].apply(convert_price)
-    except Exception as e:
-        st.error(f"가격 데이터를 변환하는 중 오류 발생: {e}")
-        return pd.DataFrame()
 
-    return df
 
+# 브라우저로 보내는 차트 데이터 행 수 상한 (차트 스펙 크기와 렌더링 비용을 제한)
+MAX_CHART_ROWS = 200
+# 단지별 보기에서 기본으로 표시할 단지 수
+DEFAULT_TOP_N = 30
 
 
-def create_bar_chart(df, title):
-    # 데이터프레임이 비어 있는 경우 처리
-    if df.empty:
-        st.warning("차트를 생성할 데이터가 없습니다.")
-        return None
+def aggregate_by_complex(df):
+    """
+    단지별 가격 통계(억)를 서버에서 미리 계산합니다.
+    :param df: create_dataframe 결과 ('단지명', '가격' 컬럼)
+    :return: '단지명', '최저가', '중앙값', '최고가', '매물 수' 컬럼 (중앙값 내림차순)
+    """
+    grouped = df.dropna(subset=['가격']).groupby('단지명', observed=True)['가격']
+    summary = grouped.agg(['min', 'median', 'max', 'count']) / [100000000, 100000000, 100000000, 1]
+    summary = summary.rename(columns={'min': '최저가', 'median': '중앙값', 'max': '최고가', 'count': '매물 수'})
+    summary['매물 수'] = summary['매물 수'].astype('int64')
+    summary = summary.reset_index().sort_values('중앙값', ascending=False, ignore_index=True)
+    summary['단지명'] = summary['단지명'].astype(str)
+    return summary
 
-    # 단지명을 문자열로 변환
-    df['단지명'] = df['단지명'].astype(str)
 
-    # Altair 바 차트 생성
-    chart = alt.Chart(df).mark_bar().encode(
-        x=alt.X('단지명:N', sort='-y', title="단지명"),
-        y=alt.Y('가격:Q', title="가격 (억)"),
-        tooltip=['단지명', '가격', '전용면적', '현재 층/전체 층']
-    ).properties(
-        title=title,
-        width=700,
-        height=400
-    )
-    return chart
+def price_histogram(df, bins=20):
+    """
+    가격(억) 분포를 구간별 매물 수로 집계합니다.
+    :return: '구간 시작', '구간 끝', '매물 수' 컬럼 (bins행 이하)
+    """
+    prices = df['가격'].dropna().to_numpy(dtype='float64') / 100000000
+    counts, edges = np.histogram(prices, bins=bins)
+    return pd.DataFrame({'구간 시작': edges[:-1], '구간 끝': edges[1:], '매물 수': counts})
 
 
-def create_bar_chart(df, title):
+def chart_data(df, view="top", top_n=DEFAULT_TOP_N, bins=20, max_rows=MAX_CHART_ROWS):
     """
-    Altair 바 차트를 생성합니다.
+    차트에 넣을 집계 데이터를 만듭니다. 반환되는 행 수는 항상 max_rows 이하입니다.
+    :param view: "top"(중앙값 상위 top_n개 단지의 최저/중앙/최고가) 또는 "bins"(가격 구간별 매물 수)
+    :return: (차트 데이터, 전체 단지 또는 구간 수)
+    """
+    with metrics.span('chart_aggregate', view=view):
+        if view == "bins":
+            histogram = price_histogram(df, bins=min(bins, max_rows))
+            return histogram, len(histogram)
+        summary = aggregate_by_complex(df)
+        return summary.head(min(top_n, max_rows)), len(summary)
+
+
+@metrics.timed('chart_build')
+def create_bar_chart(df, title, view="top", top_n=DEFAULT_TOP_N, max_rows=MAX_CHART_ROWS):
+    """
+    Altair 바 차트를 생성합니다. 매물마다 막대를 그리지 않고 서버에서 집계한 데이터만 차트에 넣습니다.
+    - view="top": 단지별 중앙값 막대와 최저~최고가 범위 (상위 top_n개 단지)
+    - view="bins": 가격 구간별 매물 수
+    :param df: create_dataframe 결과
     """
     # 데이터프레임이 비어 있는 경우 처리
     if df.empty:
         st.warning("차트를 생성할 데이터가 없습니다.")
         return None
 
-    # 데이터 타입 변환
-    df['단지명'] = df['단지명'].astype(str)  # 범주형
-    df['가격_억'] = df['가격'] / 100000000  # 가격을 억 단위로 변환
+    data, total = chart_data(df, view=view, top_n=top_n, max_rows=max_rows)
+    if data.empty:
+        return None
 
-    # 결측값 제거
-    df = df.dropna(subset=['단지명', '가격_억'])
+    if view == "bins":
+        chart = alt.Chart(data).mark_bar().encode(
+            x=alt.X('구간 시작:Q', bin='binned', title="가격 (억)", axis=alt.Axis(format='.0f')),
+            x2='구간 끝:Q',
+            y=alt.Y('매물 수:Q', title="매물 수"),
+            tooltip=[alt.Tooltip('구간 시작:Q', format=',.2f', title="가격 (억) 부터"),
+                     alt.Tooltip('구간 끝:Q', format=',.2f', title="가격 (억) 까지"), '매물 수']
+        )
+    else:
+        if total > len(data):
+            title = f"{title} (중앙값 상위 {len(data)}개 단지 / 전체 {total}개)"
+        tooltip = ['단지명', alt.Tooltip('중앙값:Q', format=',.2f', title="중앙값 (억)"),
+                   alt.Tooltip('최저가:Q', format=',.2f', title="최저가 (억)"),
+                   alt.Tooltip('최고가:Q', format=',.2f', title="최고가 (억)"), '매물 수']
+        # 데이터가 이미 중앙값 내림차순이므로 그 순서를 그대로 사용
+        base = alt.Chart(data).encode(x=alt.X('단지명:N', sort=None, title="단지명"), tooltip=tooltip)
+        bars = base.mark_bar().encode(y=alt.Y('중앙값:Q', title="가격 (억)", axis=alt.Axis(format='.0f')))
+        ranges = base.mark_rule(color='black').encode(y='최저가:Q', y2='최고가:Q')
+        chart = bars + ranges
 
-    # Altair 바 차트 생성
-    chart = alt.Chart(df).mark_bar().encode(
-        x=alt.X('단지명:N', sort='-y', title="단지명"),
-        y=alt.Y('가격_억:Q', title="가격 (억)", axis=alt.Axis(format='.0f')),  # 억 단위로 표시
-        tooltip=['단지명', alt.Tooltip('가격_억:Q', format=',.2f', title="가격 (억)"), '전용면적', '현재 층/전체 층']
-    ).properties(
+    return chart.properties(
         title=title,
         width=700,
         height=400
     )
-    return chart
 
 
 
@@ -159,9 +206,52 @@ def create_heatmap(df, title):
     if df.empty:
         st.write(f"{title} 데이터가 없습니다.")
         return
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     price_matrix = df.pivot_table(index='단지명', values='가격', aggfunc='mean')
     price_matrix = price_matrix.sort_values(by='가격', ascending=False)
     plt.figure(figsize=(10, 6))
     sns.heatmap(price_matrix, annot=True, fmt=".0f", cmap="coolwarm")
     plt.title(title)
-    st.pyplot(plt)
\ No newline at end of file
+    st.pyplot(plt)
+
+
+def metrics_debug_enabled():
+    """디버그 패널 표시 여부: DEBUG_METRICS=1 환경 변수 또는 URL의 ?debug=1"""
+    if os.environ.get('DEBUG_METRICS') == '1':
+        return True
+    # st.query_params는 1.30부터 제공되므로 고정 버전(1.26)의 experimental API 사용
+    return st.experimental_get_query_params().get('debug', [None])[0] == '1'
+
+
+def render_metrics_panel(stages=None):
+    """
+    단계별 소요 시간과 카운터를 보여 주는 디버그 패널입니다. 표시할 때 Prometheus 텍스트 파일도 갱신합니다.
+    :param stages: 표시할 단계 이름 목록 (None이면 전체)
+    """
+    snapshot = metrics.snapshot()
+    metrics.export_textfile()
+
+    with st.expander("⏱️ 성능 측정 (디버그)"):
+        spans = [span for span in snapshot['spans'] if stages is None or span['name'] in stages]
+        if spans:
+            st.dataframe(pd.DataFrame([{
+                '단계': span['name'],
+                '레이블': ', '.join(f"{key}={value}" for key, value in span['labels'].items()),
+                '횟수': span['count'],
+                '마지막(ms)': round(span['last'] * 1000, 1),
+                '평균(ms)': round(span['sum'] / span['count'] * 1000, 1),
+                '최대(ms)': round(span['max'] * 1000, 1),
+                '합계(s)': round(span['sum'], 3),
+            } for span in spans]), use_container_width=True)
+        else:
+            st.write("기록된 측정값이 없습니다.")
+
+        if snapshot['counters']:
+            st.dataframe(pd.DataFrame([{
+                '카운터': counter['name'],
+                '레이블': ', '.join(f"{key}={value}" for key, value in counter['labels'].items()),
+                '값': counter['value'],
+            } for counter in snapshot['counters']]), use_container_width=True)
+        st.caption(f"Prometheus 텍스트 파일: {metrics.METRICS_TEXTFILE}")
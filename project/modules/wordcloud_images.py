@@ -0,0 +1,103 @@
+import glob
+import os
+import time
+from io import BytesIO
+
+# 워드클라우드 한글 폰트 후보 (WORDCLOUD_FONT 환경 변수가 없을 때 순서대로 확인)
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc",
+    "/Library/Fonts/AppleGothic.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+# 후보에 없을 때 검색할 패턴
+FONT_SEARCH_PATTERNS = [
+    "/usr/share/fonts/**/NanumGothic*.ttf",
+    "/usr/share/fonts/**/NotoSansCJK*.ttc",
+    "/usr/share/fonts/**/NotoSansKR*.[ot]tf",
+    os.path.expanduser("~/.fonts/**/*Nanum*.ttf"),
+]
+
+WORDCLOUD_OPTIONS = {"width": 800, "height": 400, "background_color": "white", "colormap": "viridis"}
+
+# 폰트를 못 찾은 결과는 이 시간(초) 동안만 재사용 (그 뒤에 설치된 폰트도 다시 찾도록)
+FONT_MISS_TTL = 60.0
+
+_font_cache = {}   # font_path 인자 -> 찾은 폰트 경로
+_font_misses = {}  # font_path 인자 -> 못 찾은 시각 (time.monotonic)
+
+
+def find_wordcloud_font(font_path=None):
+    """
+    워드클라우드에 사용할 한글 폰트 경로를 찾습니다.
+    순서: font_path 인자 → WORDCLOUD_FONT 환경 변수 → 알려진 경로 → 폰트 디렉터리 검색
+    :return: 폰트 경로 (찾지 못하면 None)
+    """
+    if font_path in _font_cache:
+        return _font_cache[font_path]
+    missed_at = _font_misses.get(font_path)
+    if missed_at is not None and time.monotonic() - missed_at < FONT_MISS_TTL:
+        return None
+
+    found = _search_wordcloud_font(font_path)
+    if found is None:
+        _font_misses[font_path] = time.monotonic()
+        return None
+    _font_misses.pop(font_path, None)
+    _font_cache[font_path] = found
+    return found
+
+
+def _search_wordcloud_font(font_path):
+    configured = font_path or os.environ.get("WORDCLOUD_FONT")
+    if configured:
+        if os.path.exists(configured):
+            return configured
+        print(f"워드클라우드 폰트를 찾을 수 없습니다: {configured}")
+
+    for candidate in FONT_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    for pattern in FONT_SEARCH_PATTERNS:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if matches:
+            return matches[0]
+
+    print("한글 폰트를 찾지 못했습니다. WORDCLOUD_FONT 환경 변수로 폰트 경로를 지정하세요.")
+    return None
+
+
+def render_wordcloud_png(word_frequencies, font_path=None):
+    """
+    단어-가중치 딕셔너리로 워드클라우드를 그려 PNG 바이트로 반환합니다. (matplotlib을 거치지 않음)
+    한글 폰트가 없으면 글자가 네모로 그려지므로 그리지 않고 None을 반환합니다.
+    """
+    from wordcloud import WordCloud
+
+    font = find_wordcloud_font(font_path)
+    if font is None:
+        return None
+    wordcloud = WordCloud(font_path=font, **WORDCLOUD_OPTIONS)
+    wordcloud.generate_from_frequencies(word_frequencies)
+
+    buffer = BytesIO()
+    wordcloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def topic_wordcloud_pngs(lda_model, num_topics, topn=10, font_path=None):
+    """
+    모든 토픽의 워드클라우드 PNG를 한 번에 생성합니다.
+    :return: 토픽 순서대로 PNG 바이트 리스트 (단어가 없는 토픽은 None), 한글 폰트가 없으면 None
+    """
+    if find_wordcloud_font(font_path) is None:
+        return None
+    images = []
+    for topic_id in range(num_topics):
+        topic_terms = lda_model.show_topic(topic_id, topn=topn)
+        images.append(render_wordcloud_png(dict(topic_terms), font_path) if topic_terms else None)
+    return images
@@ -0,0 +1,33 @@
+import glob
+import json
+import os
+from gensim import corpora
+from modules.paths import DATA_DIR
+from modules.topic_modeling import perform_lda, update_lda
+
+
+def load_tokenized_texts():
+    """data/*.json 기사의 processed_body를 preprocess_data와 같은 방식(두 글자 이상)으로 나눕니다."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, '*.json'))):
+        if os.path.basename(path) == 'dong_options.json':
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.extend(article.get('processed_body', '') for article in json.load(f))
+    return [[word for word in text.split() if len(word) > 1] for text in texts if text]
+
+
+def test_update_lda_keeps_no_above_pruning():
+    tokenized_texts = load_tokenized_texts()
+    assert len(tokenized_texts) >= 200
+    full = corpora.Dictionary(tokenized_texts[:150])
+    frequent = {full[token_id] for token_id, df in full.dfs.items() if df > int(0.5 * full.num_docs)}
+    assert frequent
+
+    lda_model, _, dictionary, _ = perform_lda(tokenized_texts[:150], num_topics=3, passes=1, no_above=0.5)
+    assert not frequent & set(dictionary.token2id)
+    update_lda(lda_model, dictionary, tokenized_texts[150:200], no_above=0.5)
+
+    # 처음 학습할 때 no_above로 제거된 단어가 증분 학습으로 다시 추가되면 안 됨
+    assert not frequent & set(dictionary.token2id)
+    assert lda_model.num_terms == len(dictionary)